@@ -22,24 +22,27 @@ Usage:
 import os
 import re
 import sys
+import asyncio
+import mmap
 import argparse
+from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 from dataclasses import dataclass, field
 
 # Add parent directory to path for imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), ".")))
 
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_groq import ChatGroq
-
 from commons.constants import Constants as Co
 from commons.file_utils import FileUtils
 from commons.config import config
-from commons.llm import get_llm_model_name
+from commons.llm import get_llm_model_name, run_on_llm_loop
+from commons.utils import json_loads
 
 from app.extractors._paths import project_path
-from app.extractors import EXTRACTOR_REGISTRY, get_extractor
+from app.extractors import EXTRACTOR_REGISTRY, BaseInvoiceExtractor, get_extractor, run_batched
+from app.extractors.base_extractor import PARQUET_SUFFIX
 from app.decision import DecisionEngine
 from app.rag import PolicyExtractorWithRAG
 from app.decision.postprocessing import write_decision_outputs, write_postprocessing_output
@@ -49,6 +52,21 @@ from app.org_api import get_org_client
 EXPENSE_CATEGORIES = tuple(EXTRACTOR_REGISTRY.keys())
 
 
+_PROMPT_DIR = project_path("src", "prompt")
+_CATEGORY_TO_PROMPT = {
+    "commute": os.path.join(_PROMPT_DIR, "system_prompt_cab.txt"),
+    "meal": os.path.join(_PROMPT_DIR, "system_meal_prompt.txt"),
+    "fuel": os.path.join(_PROMPT_DIR, "system_prompt_fuel.txt"),
+}
+_CATEGORY_LABELS = {"commute": "🚗 commute", "meal": "🍽️ meal", "fuel": "⛽ fuel"}
+
+
+@lru_cache(maxsize=None)
+def _cfg(key: str) -> Dict:
+    """Top-level config section (e.g. 'paths', 'rag'); empty dict when missing. Cached per process."""
+    return config.get(key) or {}
+
+
 def _output_dir_absolute(output_dir: str) -> str:
     """Resolve output dir to absolute path (project-relative if not already absolute)."""
     if os.path.isabs(output_dir):
@@ -56,20 +74,53 @@ def _output_dir_absolute(output_dir: str) -> str:
     return project_path(output_dir)
 
 
+def _load_json_array(path: str) -> Optional[list]:
+    """
+    Load a JSON file only if it holds an array. Peeks at the first non-whitespace byte
+    via mmap so metadata files (objects) and empty files are skipped without a full parse.
+    """
+    if os.stat(path).st_size < 2:
+        return None
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        i, n = 0, len(mm)
+        while i < n and mm[i] in b" \t\r\n":
+            i += 1
+        if mm[i:i + 1] != b"[":
+            return None
+        data = json_loads(mm[i:])
+    return data if isinstance(data, list) else None
+
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _load_parquet_sibling(entry: os.DirEntry) -> Optional[list]:
+    """Bills from the Parquet copy next to a JSON output, if it is at least as new; else None (use the JSON)."""
+    pq_path = entry.path + PARQUET_SUFFIX
+    try:
+        if os.stat(pq_path).st_mtime_ns < entry.stat().st_mtime_ns:
+            return None
+        return FileUtils.read_bills_parquet(pq_path)
+    except ImportError:
+        return None
+
+
 def _emp_key_from_folder_name(folder_name: str) -> Optional[str]:
     """Derive emp_key from folder name (e.g. IIIPL-1000_naveen_oct_amex -> IIIPL-1000_naveen)."""
-    parts = folder_name.split("_")
-    if len(parts) < 4:
+    emp_id, _, rest = folder_name.partition("_")
+    emp_name_raw, _, rest = rest.partition("_")
+    if "_" not in rest:  # fewer than 4 parts
         return None
-    emp_id = parts[0]
-    emp_name_raw = parts[1]
-    name_part = re.sub(r"\s+", "", (emp_name_raw or "").strip()).lower()
-    return f"{emp_id}_{name_part}"
+    name_part = emp_name_raw.strip()
+    # Every whitespace character except " " is non-printable, so this skips the regex for plain names
+    if " " in name_part or not name_part.isprintable():
+        name_part = _WS_RE.sub("", name_part)
+    return f"{emp_id}_{name_part.lower()}"
 
 
 def _resolve_policy_path(resources_dir: str) -> str:
     """Find company_policy.pdf under resources_dir or raw resources; return resolved path."""
-    raw_resources = (config.get("paths") or {}).get("resources_dir", "resources")
+    raw_resources = _cfg("paths").get("resources_dir", "resources")
     for base in (resources_dir, raw_resources):
         p = project_path(base, "company_policy.pdf")
         if os.path.exists(p):
@@ -84,28 +135,54 @@ def _filter_employees_by_arg(employees: Dict[str, Dict[str, List[str]]], employe
     """Filter employees by --employee (partial match on key or name). Returns subset or same dict if no match needed."""
     if not employee_arg:
         return employees
-    needle = employee_arg.lower()
-    matching = {k: v for k, v in employees.items() if needle in k.lower()}
+    lowered = {k: k.casefold() for k in employees}
+    needle = employee_arg.casefold()
+    matching = {k: employees[k] for k, low in lowered.items() if needle in low}
     if not matching and "_" in employee_arg:
-        name_part = employee_arg.rsplit("_", 1)[-1].lower()
-        matching = {k: v for k, v in employees.items() if name_part in k.lower()}
+        name_part = employee_arg.rsplit("_", 1)[-1].casefold()
+        matching = {k: employees[k] for k, low in lowered.items() if name_part in low}
     return matching
 
 
+async def _afetch_org_data_for_employees(
+    employee_org_data: Dict[str, Optional[Dict]],
+    emp_keys,
+    org_client,
+    max_concurrency: int = 16,
+) -> None:
+    """
+    Fetch org API data for emp_keys concurrently (bounded by max_concurrency); mutates employee_org_data.
+    Keys that already have data are skipped, and each employee id is requested once even if several keys share it.
+    """
+    import httpx
+
+    pending = [k for k in emp_keys if employee_org_data.get(k) is None]
+    if not pending:
+        return
+    emp_ids = list(dict.fromkeys(k.split("_", 1)[0] for k in pending))
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async with httpx.AsyncClient(timeout=org_client.timeout) as client:
+        async def fetch(emp_id: str):
+            async with semaphore:
+                return await org_client.aget_employee_details(emp_id, client=client)
+
+        results = await asyncio.gather(*(fetch(i) for i in emp_ids), return_exceptions=True)
+    by_id = {i: (None if isinstance(r, BaseException) else r) for i, r in zip(emp_ids, results)}
+    for emp_key in pending:
+        employee_org_data[emp_key] = by_id.get(emp_key.split("_", 1)[0])
+
+
 def _fetch_org_data_for_employees(
     employee_org_data: Dict[str, Optional[Dict]],
     all_bills: Dict[str, List],
     org_client,
 ) -> None:
     """Populate employee_org_data with org API response for each emp_key in all_bills (mutates employee_org_data)."""
-    if not org_client:
+    if not org_client or not all_bills:
         return
-    for emp_key in all_bills:
-        emp_id = emp_key.split("_", 1)[0]
-        try:
-            employee_org_data[emp_key] = org_client.get_employee_details(emp_id)
-        except Exception:
-            employee_org_data[emp_key] = None
+    max_concurrency = _cfg("org_api").get("max_concurrency", 16)
+    asyncio.run(_afetch_org_data_for_employees(employee_org_data, all_bills, org_client, max_concurrency))
 
 
 # =============================================================================
@@ -114,7 +191,7 @@ def _fetch_org_data_for_employees(
 
 def _default_resources_dir() -> str:
     """Default: standardized processed inputs (processed_dir), else raw resources_dir."""
-    paths = config.get("paths") or {}
+    paths = _cfg("paths")
     return paths.get("processed_dir") or paths.get("resources_dir", "resources")
 
 
@@ -122,14 +199,25 @@ def _default_resources_dir() -> str:
 class AppConfig:
     """Application configuration loaded from config.yaml"""
     resources_dir: str = field(default_factory=_default_resources_dir)
-    output_dir: str = field(default_factory=lambda: (config.get("paths") or {}).get("output_dir", "resources/model_output"))
+    output_dir: str = field(default_factory=lambda: _cfg("paths").get("output_dir", "resources/model_output"))
     model_name: str = field(default_factory=get_llm_model_name)
-    temperature: float = field(default_factory=lambda: (config.get(Co.LLM) or {}).get(Co.TEMPERATURE, 0))
-    enable_rag: bool = field(default_factory=lambda: config.get("rag", {}).get("enabled", False))
-    rag_chunk_size: int = field(default_factory=lambda: config.get("rag", {}).get("chunk_size", 500))
-    rag_chunk_overlap: int = field(default_factory=lambda: config.get("rag", {}).get("chunk_overlap", 50))
-    rag_top_k: int = field(default_factory=lambda: config.get("rag", {}).get("top_k", 5))
-    rag_embedding_model: str = field(default_factory=lambda: config.get("rag", {}).get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2"))
+    temperature: float = field(default_factory=lambda: _cfg(Co.LLM).get(Co.TEMPERATURE, 0))
+    enable_rag: bool = field(default_factory=lambda: _cfg("rag").get("enabled", False))
+    rag_chunk_size: int = field(default_factory=lambda: _cfg("rag").get("chunk_size", 500))
+    rag_chunk_overlap: int = field(default_factory=lambda: _cfg("rag").get("chunk_overlap", 50))
+    rag_top_k: int = field(default_factory=lambda: _cfg("rag").get("top_k", 5))
+    rag_embedding_model: str = field(default_factory=lambda: _cfg("rag").get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2"))
+    max_workers: int = field(default_factory=lambda: _cfg("extraction").get("max_workers", 4))
+    extraction_batch_size: int = field(default_factory=lambda: _cfg("extraction").get("batch_size", 8))
+    extraction_max_concurrency: int = field(default_factory=lambda: _cfg("extraction").get("max_concurrency", 4))
+    rag_embedding_batch_size: int = field(default_factory=lambda: _cfg("rag").get("embedding_batch_size", 64))
+    rag_cache_path: Optional[str] = field(default_factory=lambda: _cfg("rag").get("cache_path"))
+    decision_batch_size: int = field(default_factory=lambda: _cfg("decision").get("batch_size", 16))
+    decision_max_concurrency: int = field(default_factory=lambda: _cfg("decision").get("max_concurrency", 4))
+    decision_cache_path: Optional[str] = field(default_factory=lambda: _cfg("decision").get("cache_path"))
+    decision_stream: bool = field(default_factory=lambda: _cfg("decision").get("stream", True))
+    decision_rule_fast_path: bool = field(default_factory=lambda: _cfg("decision").get("rule_fast_path", True))
+    decision_retry_missing: bool = field(default_factory=lambda: _cfg("decision").get("retry_missing", True))
 
 
 # =============================================================================
@@ -153,31 +241,37 @@ class BillDeskApp:
         self.employee_org_data = {}  # key: "emp_id_emp_name", value: org API response or None (optional enrichment)
         self.policy = None  # extracted policy JSON (used for validation limits and decision engine)
 
+    def _scan_category(self, category: str) -> List[tuple]:
+        """List (emp_key, folder_path) for every employee folder under resources/<category>."""
+        found: List[tuple] = []
+        try:
+            it = os.scandir(project_path(self.config.resources_dir, category))
+        except FileNotFoundError:
+            return found
+        with it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                key = _emp_key_from_folder_name(entry.name)
+                if key:
+                    found.append((key, entry.path))
+        return found
+
     def discover_employees(self) -> Dict[str, Dict[str, List[str]]]:
         """
         Discover all employee folders in resources. Supports multiple months per employee:
         folder names {emp_id}_{emp_name}_{month}_{client} or {emp_id}_{emp_name}_{month}_{year}_{client}.
         emp_name is normalized (concatenated without spaces) so 'John', 'John Doe', 'John  Doe' match the same employee.
         Returns dict: emp_key -> { category -> [folder_path, ...] } (all months collected).
+        Categories are scanned concurrently (independent directory listings, slow on network shares).
         """
-        employees: Dict[str, Dict[str, List[str]]] = {}
-        base = project_path(self.config.resources_dir)
-
-        for category in EXPENSE_CATEGORIES:
-            category_path = os.path.join(base, category)
-            if not os.path.exists(category_path):
-                continue
-            for folder_name in os.listdir(category_path):
-                folder_path = os.path.join(category_path, folder_name)
-                if not os.path.isdir(folder_path):
-                    continue
-                key = _emp_key_from_folder_name(folder_name)
-                if not key:
-                    continue
-                if key not in employees:
-                    employees[key] = {c: [] for c in EXPENSE_CATEGORIES}
+        employees: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: {c: [] for c in EXPENSE_CATEGORIES})
+        with ThreadPoolExecutor(max_workers=len(EXPENSE_CATEGORIES) or 1) as executor:
+            scans = list(executor.map(self._scan_category, EXPENSE_CATEGORIES))
+        for category, found in zip(EXPENSE_CATEGORIES, scans):
+            for key, folder_path in found:
                 employees[key][category].append(folder_path)
-        return employees
+        return dict(employees)
 
     def process_employee(self, emp_key: str, folders: Dict[str, List[str]]) -> List[Dict]:
         """
@@ -189,32 +283,40 @@ class BillDeskApp:
         print(f"{'=' * 60}")
 
         results = []
-        prompt_dir = project_path("src", "prompt")
-        category_to_prompt = {
-            "commute": os.path.join(prompt_dir, "system_prompt_cab.txt"),
-            "meal": os.path.join(prompt_dir, "system_meal_prompt.txt"),
-            "fuel": os.path.join(prompt_dir, "system_prompt_fuel.txt"),
-        }
-        category_labels = {"commute": "🚗 commute", "meal": "🍽️ meal", "fuel": "⛽ fuel"}
-
         for category in EXPENSE_CATEGORIES:
             folder_list = folders.get(category) or []
             if not folder_list or (self.args.category and self.args.category != category):
                 continue
+            prompt_path = _CATEGORY_TO_PROMPT.get(category)
+            label = _CATEGORY_LABELS.get(category, category)
+            extractors = []
             for folder_path in folder_list:
                 extractor = get_extractor(
                     category,
                     input_folder=folder_path,
-                    system_prompt_path=category_to_prompt.get(category),
+                    system_prompt_path=prompt_path,
                     policy=self.policy,
                 )
                 if not extractor:
                     continue
-                print(f"\n{category_labels.get(category, category)} invoices from: {folder_path}")
-                category_results = extractor.run(save_to_file=True)
-                if category_results:
-                    results.extend(category_results)
-                    print(f"✅ Extracted {len(category_results)} {category} invoices")
+                print(f"\n{label} invoices from: {folder_path}")
+                extractors.append(extractor)
+            if not extractors:
+                continue
+
+            batch_size = self.config.extraction_batch_size
+            if batch_size > 0 and all(isinstance(e, BaseInvoiceExtractor) for e in extractors):
+                category_results = run_batched(
+                    extractors, batch_size, save_to_file=True,
+                    max_concurrency=self.config.extraction_max_concurrency,
+                )
+            else:
+                category_results = []
+                for extractor in extractors:
+                    category_results.extend(extractor.run(save_to_file=True) or [])
+            if category_results:
+                results.extend(category_results)
+                print(f"✅ Extracted {len(category_results)} {category} invoices")
 
         return results
 
@@ -231,34 +333,46 @@ class BillDeskApp:
             print(f"❌ Failed to load policy: {e}")
             return None
 
-    def _load_bills_from_output(self) -> Dict[str, List[Dict]]:
-        """Load all bills from existing extraction output (category/model_name/folder_name JSON files)."""
+    def _load_bills_from_output(self) -> tuple[Dict[str, List[Dict]], int]:
+        """
+        Load all bills from existing extraction output (category/model_name/folder_name JSON files,
+        preferring an up-to-date .parquet copy when present). Returns (bills, count).
+        """
         base = _output_dir_absolute(self.config.output_dir)
-        all_bills: Dict[str, List[Dict]] = {}
+        all_bills: Dict[str, List[Dict]] = defaultdict(list)
+        bill_count = 0
+        model_name = self.config.model_name
         for category in EXPENSE_CATEGORIES:
-            category_dir = os.path.join(base, category, self.config.model_name)
-            if not os.path.isdir(category_dir):
+            try:
+                it = os.scandir(os.path.join(base, category, model_name))
+            except (FileNotFoundError, NotADirectoryError):
                 continue
-            for name in os.listdir(category_dir):
-                path = os.path.join(category_dir, name)
-                if not os.path.isfile(path):
+            with it:
+                entries = [e for e in it if e.is_file()]
+            names = {e.name for e in entries}
+            for entry in entries:
+                if entry.name.endswith(PARQUET_SUFFIX):
                     continue
                 try:
-                    data = FileUtils.load_json_from_file(path)
+                    data = None
+                    if entry.name + PARQUET_SUFFIX in names:
+                        data = _load_parquet_sibling(entry)
+                    if data is None:
+                        data = _load_json_array(entry.path)
                 except Exception:
                     continue
-                if not isinstance(data, list):
+                if data is None:
                     continue
-                emp_key = _emp_key_from_folder_name(name)
+                emp_key = _emp_key_from_folder_name(entry.name)
                 if not emp_key:
                     continue
-                if emp_key not in all_bills:
-                    all_bills[emp_key] = []
+                emp_bills = all_bills[emp_key]
                 for b in data:
                     if isinstance(b, dict) and b.get("category") is None:
                         b = {**b, "category": category}
-                    all_bills[emp_key].append(b)
-        return all_bills
+                    emp_bills.append(b)
+                bill_count += len(data)
+        return dict(all_bills), bill_count
 
     def _write_decisions(self, decisions: List[Dict]) -> None:
         """Write decision outputs (audit JSON, summary, CSV, README, org data) via post-processing."""
@@ -299,32 +413,37 @@ class BillDeskApp:
             _output_dir_absolute(self.config.output_dir), self.config.model_name,
         )
 
-        # 2. Split by category for per-category decision runs
+        # 2. Split by category for per-category decision runs (one pass each over groups and save data)
         groups_by_cat: Dict[str, list] = {c: [] for c in EXPENSE_CATEGORIES}
         for g in groups_data_all:
-            cat = (g.category or "unknown").strip().lower()
-            if cat in groups_by_cat:
-                groups_by_cat[cat].append(g)
+            bucket = groups_by_cat.get((g.category or "unknown").strip().lower())
+            if bucket is not None:
+                bucket.append(g)
         save_by_cat: Dict[str, list] = {c: [] for c in EXPENSE_CATEGORIES}
         for s in save_data_all:
-            cat = (s.get("category") or "unknown").strip().lower()
-            if cat in save_by_cat:
-                save_by_cat[cat].append(s)
+            bucket = save_by_cat.get((s.get("category") or "unknown").strip().lower())
+            if bucket is not None:
+                bucket.append(s)
+
+        # 3. Run decision engine per category (LLM + copy only; no preprocessing). Categories are
+        # independent, so they are decided concurrently; results are collected in category order.
+        categories = [c for c, groups_cat in groups_by_cat.items() if groups_cat]
+        print(f"\n⚖️ Running decision engine for categories: {', '.join(categories)}...")
+
+        async def decide_all():
+            return await asyncio.gather(*(
+                self.decision_engine.arun_with_prepared(
+                    groups_by_cat[category],
+                    save_by_cat[category],
+                    policy,
+                    employee_org_data=org_data,
+                    category=category,
+                )
+                for category in categories
+            ))
 
-        # 3. Run decision engine per category (LLM + copy only; no preprocessing)
-        for category in EXPENSE_CATEGORIES:
-            groups_cat = groups_by_cat.get(category) or []
-            save_cat = save_by_cat.get(category) or []
-            if not groups_cat:
-                continue
-            print(f"\n⚖️ Running decision engine for category: {category}...")
-            decisions_cat = self.decision_engine.run_with_prepared(
-                groups_cat,
-                save_cat,
-                policy,
-                employee_org_data=org_data,
-                category=category,
-            )
+        # On the shared LLM loop (not asyncio.run): the engine awaits its LLM calls on this loop
+        for decisions_cat in run_on_llm_loop(decide_all()):
             all_decisions.extend(decisions_cat)
         return all_decisions
 
@@ -353,11 +472,11 @@ class BillDeskApp:
         self.policy = self._load_policy_from_output()
         if not self.policy:
             return
-        self.all_bills = self._load_bills_from_output()
+        self.all_bills, bill_count = self._load_bills_from_output()
         if not self.all_bills:
             print("❌ No bills found in output. Run full flow first (without --decision-only).")
             return
-        print(f"📂 Loaded policy and {sum(len(v) for v in self.all_bills.values())} bills for {len(self.all_bills)} employee(s)")
+        print(f"📂 Loaded policy and {bill_count} bills for {len(self.all_bills)} employee(s)")
         self._init_decision_engine()
         _fetch_org_data_for_employees(self.employee_org_data, self.all_bills, get_org_client())
         decisions = self._run_decision_engine_per_category(self.policy)
@@ -367,7 +486,9 @@ class BillDeskApp:
         print("=" * 60)
 
     def _init_decision_engine(self) -> None:
-        """Create decision engine with current config."""
+        """Create decision engine with current config. With RAG, policy context is retrieved once per category here."""
+        if self.config.enable_rag:
+            self.policy_extractor.precompute_categories(EXPENSE_CATEGORIES)
         self.decision_engine = DecisionEngine(
             model_name=self.config.model_name,
             temperature=self.config.temperature,
@@ -375,6 +496,12 @@ class BillDeskApp:
             resources_dir=self.config.resources_dir,
             enable_rag=self.config.enable_rag,
             policy_extractor=self.policy_extractor if self.config.enable_rag else None,
+            batch_size=self.config.decision_batch_size,
+            max_concurrency=self.config.decision_max_concurrency,
+            cache_path=project_path(self.config.decision_cache_path) if self.config.decision_cache_path else None,
+            stream=self.config.decision_stream,
+            rule_fast_path=self.config.decision_rule_fast_path,
+            retry_missing=self.config.decision_retry_missing,
         )
 
     def _run_full_flow(self) -> None:
@@ -400,14 +527,28 @@ class BillDeskApp:
         org_client = get_org_client()
         if org_client:
             print("📡 Org API enabled: fetching employee/leave/manager data for enrichment")
-        for emp_key, folders in employees.items():
-            if org_client:
-                emp_id = emp_key.split("_", 1)[0]
+        # Employees are independent (OCR + LLM I/O): process them in a thread pool, with the
+        # org API fetch overlapping as its own task. Results are merged in discovery order.
+        # Workers never start their own event loop for LLM calls: batched extraction is submitted to the
+        # one shared LLM loop (run_on_llm_loop), so the shared async HTTP client stays on a single loop.
+        results_by_emp: Dict[str, List[Dict]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, self.config.max_workers)) as executor:
+            org_future = executor.submit(
+                _fetch_org_data_for_employees, self.employee_org_data, employees, org_client
+            )
+            futures = {
+                executor.submit(self.process_employee, emp_key, folders): emp_key
+                for emp_key, folders in employees.items()
+            }
+            for future in as_completed(futures):
+                emp_key = futures[future]
                 try:
-                    self.employee_org_data[emp_key] = org_client.get_employee_details(emp_id)
-                except Exception:
-                    self.employee_org_data[emp_key] = None
-            results = self.process_employee(emp_key, folders)
+                    results_by_emp[emp_key] = future.result()
+                except Exception as e:
+                    print(f"❌ Processing failed for {emp_key}: {e}")
+            org_future.result()
+        for emp_key in employees:
+            results = results_by_emp.get(emp_key)
             if results:
                 self.all_bills[emp_key] = results
 
@@ -446,7 +587,7 @@ Examples:
         """
     )
 
-    paths_cfg = config.get("paths") or {}
+    paths_cfg = _cfg("paths")
     default_resources = paths_cfg.get("processed_dir") or paths_cfg.get("resources_dir", "resources")
     parser.add_argument(
         "--resources-dir",
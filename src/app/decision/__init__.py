@@ -1,6 +1,7 @@
 """Decision pipeline: preprocessing → engine (LLM) → postprocessing. Extend via injectable dependencies."""
 
 from entity.employee import DecisionGroup
+from app.decision.cache import DecisionCache
 from app.decision.engine import DecisionEngine
 from app.decision.preprocessing import run_preprocessing, write_preprocessing_output
 from app.decision.postprocessing import (
@@ -12,6 +13,7 @@ from app.decision.postprocessing import (
 )
 
 __all__ = [
+    "DecisionCache",
     "DecisionEngine",
     "DecisionGroup",
     "run_preprocessing",
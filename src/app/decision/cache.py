@@ -0,0 +1,111 @@
+"""Exact-match cache of enriched decisions (SQLite), keyed by model, prompt, policy, the group's org entry and group."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from commons.utils import json_dumps_bytes, json_loads
+
+
+def _canonical(data: Any) -> bytes:
+    """Key-sorted compact JSON bytes (orjson when installed); str() for anything JSON can't encode."""
+    try:
+        return json_dumps_bytes(data, sort_keys=True)
+    except TypeError:
+        return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+class DecisionCache:
+    """
+    Maps blake2b-128(model, temperature, system prompt, policy, the group's own org data entry, group) to the
+    decision produced for that group. Any change to the policy or prompt changes the key, so stale entries are
+    simply never hit; org data changes for other employees don't invalidate it.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS decisions ("
+                "key TEXT PRIMARY KEY, decision TEXT NOT NULL, model TEXT, created_at TEXT)"
+            )
+
+    @staticmethod
+    def key_prefix(model: str, temperature: float, system_prompt: str, policy: Dict) -> "hashlib.blake2b":
+        """Hasher over the parts shared by every group in a run; serialize the policy once, not per group."""
+        h = hashlib.blake2b(digest_size=16)
+        for data in (
+            model.encode("utf-8"),
+            repr(float(temperature)).encode("utf-8"),
+            system_prompt.encode("utf-8"),
+            _canonical(policy),
+        ):
+            h.update(len(data).to_bytes(8, "little"))
+            h.update(data)
+        return h
+
+    @staticmethod
+    def group_key(prefix: "hashlib.blake2b", group: Dict, employee_org_data: Optional[Dict] = None) -> str:
+        """
+        Key for one group under a key_prefix() hasher (the prefix itself is left untouched). Only the group's
+        own "<employee_id>_<employee_name>" entry of employee_org_data is part of the key.
+        """
+        org_entry = (employee_org_data or {}).get(f"{group.get('employee_id')}_{group.get('employee_name')}")
+        h = prefix.copy()
+        for data in (_canonical(org_entry), _canonical(group)):
+            h.update(len(data).to_bytes(8, "little"))
+            h.update(data)
+        return h.hexdigest()
+
+    @staticmethod
+    def key(
+        model: str,
+        temperature: float,
+        system_prompt: str,
+        policy: Dict,
+        employee_org_data: Optional[Dict],
+        group: Dict,
+    ) -> str:
+        prefix = DecisionCache.key_prefix(model, temperature, system_prompt, policy)
+        return DecisionCache.group_key(prefix, group, employee_org_data)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Cached decisions for the keys that are present."""
+        if not keys:
+            return {}
+        found: Dict[str, Dict] = {}
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, decision FROM decisions WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, decision in rows:
+                    try:
+                        found[key] = json_loads(decision)
+                    except (ValueError, TypeError):
+                        continue
+        return found
+
+    def put_many(self, entries: Dict[str, Dict], model: str) -> None:
+        if not entries:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [(key, _canonical(decision).decode("utf-8"), model, now) for key, decision in entries.items()]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?)", rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
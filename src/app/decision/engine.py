@@ -2,33 +2,37 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Final, List, Optional, Tuple
 
+from langchain_core.messages import HumanMessage
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 
 from commons.file_utils import FileUtils
-from commons.llm import get_llm
+from commons.llm import cacheable_system_message, get_llm, run_on_llm_loop
+from commons.utils import json_dumps, json_loads
 
+from entity.decision_schema import DecisionItem, EnrichedDecision
 from entity.employee import DecisionGroup
-from app.extractors.base_extractor import _extract_json_from_llm_output
+from app.extractors._paths import project_path
+from app.extractors.base_extractor import _decode_json_from_llm_output
 
+from app.decision.cache import DecisionCache
 from app.decision.preprocessing import run_preprocessing, write_preprocessing_output
-from app.decision.postprocessing import copy_files
+from app.decision.postprocessing import _normalize_category, copy_files
 
 # -----------------------------------------------------------------------------
 # Constants
 # -----------------------------------------------------------------------------
 
-_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
-
 # OpenAI structured output: enforce JSON array of decision objects via json_schema.
 # Root must be an object (OpenAI constraint); we use "decisions" key for the array.
-_DECISION_JSON_SCHEMA = {
+# Every property the prompt asks for is required and no extra keys are allowed, so constrained
+# decoders compile one fixed shape instead of every optional-field combination.
+_DECISION_JSON_SCHEMA: Final[Dict[str, Any]] = {
     "type": "json_schema",
     "json_schema": {
         "name": "expense_decisions",
@@ -62,6 +66,7 @@ _DECISION_JSON_SCHEMA = {
                                         "reason": {"type": "string"},
                                     },
                                     "required": ["bill_id", "reason"],
+                                    "additionalProperties": False,
                                 },
                             },
                             "claimed_amount": {"type": "number"},
@@ -79,15 +84,18 @@ _DECISION_JSON_SCHEMA = {
                             "category",
                             "valid_bill_ids",
                             "invalid_bill_ids",
+                            "invalid_bill_reasons",
                             "claimed_amount",
                             "approved_amount",
                             "currency",
                             "reasons",
                         ],
+                        "additionalProperties": False,
                     },
                 },
             },
             "required": ["decisions"],
+            "additionalProperties": False,
         },
     },
 }
@@ -102,129 +110,315 @@ def _decision_response_format() -> Dict[str, Any]:
 # Decision output: enrich parsed LLM response
 # -----------------------------------------------------------------------------
 
-def _build_error_summary(invalid_bill_reasons: List[Dict]) -> List[Dict[str, Any]]:
-    """Group invalid bill reasons into summary: [{reason, bill_ids, count}, ...]."""
-    by_reason: Dict[str, Dict[str, Any]] = {}
-    for r in invalid_bill_reasons:
-        reason = r.get("reason", "")
-        if reason not in by_reason:
-            by_reason[reason] = {"reason": reason, "bill_ids": [], "count": 0}
-        by_reason[reason]["bill_ids"].append(r.get("bill_id"))
-        by_reason[reason]["count"] += 1
-    return list(by_reason.values())
-
-
 # Threshold below which a decision is flagged for manual review
-CONFIDENCE_MANUAL_REVIEW_THRESHOLD = 0.5
+CONFIDENCE_MANUAL_REVIEW_THRESHOLD: Final[float] = 0.5
 
 
-def _compute_confidence_score(group: Dict) -> float:
+def _compute_confidence_score(group: DecisionGroup, amt: Optional[float]) -> float:
     """
-    Compute confidence score (0–1) for a decision group.
+    Compute confidence score (0–1) for a decision group; amt is its claimed total (daily for meal, else monthly).
     Lower when important fields (month, amount) are missing or when bills are invalid,
     so low-confidence decisions can be routed to manual review.
     """
-    score = 1.0
-    month = (group.get("month") or "").strip().lower()
-    if not month or month == "unknown":
+    score: float = 1.0
+    if (group.month or "").strip().lower() in ("", "unknown"):
         score -= 0.25
-    category = (group.get("category") or "").strip().lower()
-    if category == "meal":
-        amt = group.get("daily_total")
-    else:
-        amt = group.get("monthly_total")
     if amt is None or (isinstance(amt, (int, float)) and amt == 0):
         score -= 0.35
-    valid = group.get("valid_bills") or []
-    if not valid:
+    if not group.valid_bills:
         score -= 0.30
-    invalid = group.get("invalid_bills") or []
+    invalid = group.invalid_bills
     if invalid:
         score -= 0.10 * min(1.0, len(invalid) / 3.0)
     return max(0.0, min(1.0, score))
 
 
-def _enrich_decision_item(item: Dict, group: Dict) -> None:
+_NO_REASON: Final[str] = "Rejected (no specific reason provided)"
+
+
+def _enrich_decision_item(item: Dict, group: DecisionGroup) -> None:
     """Set currency, amounts (same fields as preprocessing), approved_amount, invalid_bill_reasons, error_summary."""
+    # Read straight from the (slotted) group: no per-item group.to_dict() copy
+    group_category = (group.category or "").strip().lower()
+    # Only the group's own category picks the meal (daily) totals, never the LLM's echo of it
+    is_meal = group_category == "meal"
     # Use canonical category from group so postprocessing summary has consistent keys (meal, commute, fuel)
-    item["category"] = (group.get("category") or item.get("category") or "unknown").strip().lower()
-    currency = group.get("currency") or "INR"
-    item["currency"] = currency
+    category = group_category or (item.get("category") or "unknown").strip().lower()
+    item["category"] = category
+    item["currency"] = group.currency or "INR"
     # Same amount fields as preprocessing groups (for alignment in postprocessing output)
-    item["daily_total"] = group.get("daily_total")
-    item["monthly_total"] = group.get("monthly_total")
-    if group.get("daily_limit") is not None:
-        item["daily_limit"] = group.get("daily_limit")
-    if group.get("reimbursable_daily_total") is not None:
-        item["reimbursable_daily_total"] = group.get("reimbursable_daily_total")
-    if group.get("daily_total_exceeds_limit") is not None:
-        item["daily_total_exceeds_limit"] = group.get("daily_total_exceeds_limit")
+    item["daily_total"] = group.daily_total
+    item["monthly_total"] = group.monthly_total
+    if group.daily_limit is not None:
+        item["daily_limit"] = group.daily_limit
+    if group.reimbursable_daily_total is not None:
+        item["reimbursable_daily_total"] = group.reimbursable_daily_total
+    if group.daily_total_exceeds_limit is not None:
+        item["daily_total_exceeds_limit"] = group.daily_total_exceeds_limit
     # Claimed amount (derived, for backward compatibility)
-    if group.get("category") == "meal":
-        item["claimed_amount"] = float(group.get("daily_total") or 0)
-    else:
-        item["claimed_amount"] = float(group.get("monthly_total") or 0)
-
-    if (item.get("decision") or "").upper() == "REJECT":
-        valid_ids = item.get("valid_bill_ids") or []
-        invalid_ids = item.get("invalid_bill_ids") or []
-        item["invalid_bill_ids"] = list(valid_ids) + list(invalid_ids)
+    item["claimed_amount"] = float((group.daily_total if is_meal else group.monthly_total) or 0)
+
+    # Normalize decision once here so downstream summaries can compare it directly
+    decision = (item.get("decision") or "").strip().upper()
+    if decision:
+        item["decision"] = decision
+    if decision == "REJECT":
+        item["invalid_bill_ids"] = [*(item.get("valid_bill_ids") or ()), *(item.get("invalid_bill_ids") or ())]
         item["valid_bill_ids"] = []
         item["approved_amount"] = 0
     else:
-        if group.get("category") == "meal":
-            item["approved_amount"] = group.get("reimbursable_daily_total") or group.get("daily_total") or 0
+        if is_meal:
+            approved = group.reimbursable_daily_total or group.daily_total or 0
         else:
-            item["approved_amount"] = group.get("monthly_total") or 0
+            approved = group.monthly_total or 0
         try:
-            item["approved_amount"] = float(item["approved_amount"])
+            item["approved_amount"] = float(approved)
         except (TypeError, ValueError):
             item["approved_amount"] = 0
 
-    item["month"] = group.get("month", "unknown")
-    item["date"] = group.get("date")
-
-    reason_lookup = {r["bill_id"]: r["reason"] for r in (group.get("invalid_bill_reasons") or [])}
-    for r in (item.get("invalid_bill_reasons") or []):
-        bid = r.get("bill_id")
-        if bid and r.get("reason"):
-            reason_lookup[bid] = (r.get("reason") or "").strip() or reason_lookup.get(bid)
-    invalid_bill_reasons = [
-        {"bill_id": bid, "reason": reason_lookup.get(bid) or "Rejected (no specific reason provided)"}
-        for bid in (item.get("invalid_bill_ids") or [])
-    ]
-    item["invalid_bill_reasons"] = invalid_bill_reasons
-    item["error_summary"] = _build_error_summary(invalid_bill_reasons)
-
-    confidence = _compute_confidence_score(group)
+    item["month"] = group.month
+    item["date"] = group.date
+
+    invalid_ids = item.get("invalid_bill_ids")
+    if not invalid_ids:
+        # Common APPROVE case: nothing rejected, so no reasons to look up or summarise
+        item["invalid_bill_reasons"] = []
+        item["error_summary"] = []
+    else:
+        # Validation reasons from preprocessing, overridden by non-empty reasons the LLM gave
+        reason_lookup = {r["bill_id"]: r["reason"] for r in (group.invalid_bill_reasons or ())}
+        for r in (item.get("invalid_bill_reasons") or ()):
+            bid = r.get("bill_id")
+            if not bid:
+                continue
+            reason = (r.get("reason") or "").strip()
+            if reason:
+                reason_lookup[bid] = reason
+        # invalid_bill_reasons and error_summary in one pass. Every stored reason is non-empty (preprocessing
+        # always names one, blank LLM reasons are skipped above), so get() with a default is enough
+        invalid_bill_reasons: List[Dict[str, Any]] = []
+        by_reason: Dict[str, Dict[str, Any]] = {}
+        reason_for = reason_lookup.get
+        for bid in invalid_ids:
+            reason = reason_for(bid, _NO_REASON)
+            invalid_bill_reasons.append({"bill_id": bid, "reason": reason})
+            summary = by_reason.get(reason)
+            if summary is None:
+                summary = by_reason[reason] = {"reason": reason, "bill_ids": [], "count": 0}
+            summary["bill_ids"].append(bid)
+            summary["count"] += 1
+        item["invalid_bill_reasons"] = invalid_bill_reasons
+        item["error_summary"] = list(by_reason.values())
+
+    confidence = _compute_confidence_score(group, group.daily_total if is_meal else group.monthly_total)
     item["confidence_score"] = round(confidence, 2)
     item["manual_review"] = confidence < CONFIDENCE_MANUAL_REVIEW_THRESHOLD
 
 
+def _validated_item(item: Any) -> Dict:
+    """LLM decision object checked and coerced against DecisionItem; raises ValueError (ValidationError) if malformed."""
+    return DecisionItem.model_validate(item).model_dump(exclude_unset=True)
+
+
+def _try_rule_decide(group: DecisionGroup) -> Optional[EnrichedDecision]:
+    """
+    Decision for groups the prompt's rules settle without judgement, or None when the LLM is needed:
+    no valid bills -> REJECT; a meal day with only valid bills and the policy limit applied -> APPROVE
+    (capped at reimbursable_daily_total). Cab/fuel limits are left to the LLM.
+    """
+    if not group.valid_bills:
+        item = {
+            "decision": "REJECT",
+            "invalid_bill_ids": list(group.invalid_bills),
+            "reasons": ["No valid bills for this group (total = 0)."],
+        }
+    elif group.category == "meal" and not group.invalid_bills and group.daily_limit is not None:
+        if group.daily_total_exceeds_limit:
+            reason = (
+                f"Daily total {group.daily_total} capped at policy limit {group.daily_limit} {group.currency}; "
+                f"approved with reimbursable_daily_total {group.reimbursable_daily_total}."
+            )
+        else:
+            reason = f"Daily total {group.daily_total} within policy limit {group.daily_limit} {group.currency}."
+        item = {
+            "decision": "APPROVE",
+            "valid_bill_ids": list(group.valid_bills),
+            "invalid_bill_ids": [],
+            "reasons": [reason],
+        }
+    else:
+        return None
+    item["employee_id"] = group.employee_id
+    item["employee_name"] = group.employee_name
+    _enrich_decision_item(item, group)
+    item["decided_by"] = "rules"
+    item["parse_failed"] = False
+    return item
+
+
 # -----------------------------------------------------------------------------
 # Engine: LLM invoke and parse
 # -----------------------------------------------------------------------------
 
-def _invoke_decision_llm(
-    llm: Any,
+def _compact_json(data: Any) -> str:
+    """Compact JSON (orjson when installed): indentation only adds input tokens for the model."""
+    return json_dumps(data)
+
+
+def _decision_system_message(
     system_prompt: str,
     policy: Dict,
-    groups_data: List[DecisionGroup],
     employee_org_data: Optional[Dict[str, Any]],
-) -> str:
-    """Build payload, run LLM chain, return raw output string."""
-    payload: Dict[str, Any] = {"policy": policy, "groups": [g.to_dict() for g in groups_data]}
+) -> Any:
+    """
+    Instructions, policy and org data (same for every batch and category in a run) as one cacheable
+    system prefix. Built once per decision call and shared by all its batches.
+    """
+    static_parts = [system_prompt, "Policy:\n" + _compact_json(policy)]
     if employee_org_data:
-        payload["employee_org_data"] = employee_org_data
-        print("   📎 Using org data (employee/leave/manager) for enrichment")
+        static_parts.append("Employee org data (employee/leave/manager):\n" + _compact_json(employee_org_data))
+    return cacheable_system_message(*static_parts)
+
+
+def _decision_messages(system_message: Any, group_dicts: List[Dict]) -> List[Any]:
+    """Static system prefix + the only per-call part: the groups (as DecisionGroup.to_dict() payloads)."""
     # OpenAI response_format=json_object requires the word "json" in messages
-    user_prompt = "Respond with a JSON array only (one object per group).\n\n" + json.dumps(payload, indent=2)
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "{system_prompt}"),
-        ("human", "{user_prompt}"),
-    ])
-    chain = prompt | llm | StrOutputParser()
-    return chain.invoke({"system_prompt": system_prompt, "user_prompt": user_prompt})
+    user_prompt = "Respond with a JSON array only (one object per group).\n\nGroups:\n" + _compact_json(group_dicts)
+    return [system_message, HumanMessage(content=user_prompt)]
+
+
+class _StreamingDecisions:
+    """
+    Incremental parse of decision output: each object of the (first) JSON array is parsed and enriched as soon
+    as its closing brace arrives, while the rest of the response is still being generated.
+    decisions() is None unless exactly one clean object per group was seen; callers then fall back to
+    _parse_and_enrich_decisions on the full text (repair, placeholders, mismatch handling).
+    """
+
+    def __init__(self, groups_data: List[DecisionGroup]):
+        self._groups = groups_data
+        self._parts: List[str] = []
+        self._items: List[Dict] = []
+        self._depth = 0
+        self._array_depth: Optional[int] = None
+        self._in_string = False
+        self._escape = False
+        self._item_parts: Optional[List[str]] = None
+        self._finished = False  # first array closed: ignore the rest
+        self._broken = False
+
+    @property
+    def raw(self) -> str:
+        return "".join(self._parts)
+
+    def decisions(self) -> Optional[List[Dict]]:
+        if self._broken or len(self._items) != len(self._groups):
+            return None
+        return self._items
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._parts.append(chunk)
+        if self._broken or self._finished:
+            return
+        start = 0 if self._item_parts is not None else None
+        for i, c in enumerate(chunk):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                continue
+            if c == '"':
+                self._in_string = True
+            elif c == "[" or c == "{":
+                self._depth += 1
+                if self._array_depth is None:
+                    if c == "[":
+                        self._array_depth = self._depth
+                elif c == "{" and self._item_parts is None and self._depth == self._array_depth + 1:
+                    self._item_parts = []
+                    start = i
+            elif c == "]" or c == "}":
+                self._depth -= 1
+                if self._array_depth is None:
+                    continue
+                if self._item_parts is not None and self._depth == self._array_depth:
+                    self._item_parts.append(chunk[start : i + 1])
+                    self._complete("".join(self._item_parts))
+                    self._item_parts = None
+                    start = None
+                    if self._broken:
+                        return
+                elif self._depth < self._array_depth:
+                    self._finished = True
+                    return
+        if self._item_parts is not None:
+            self._item_parts.append(chunk[start:])
+
+    def _complete(self, text: str) -> None:
+        idx = len(self._items)
+        try:
+            item = json_loads(text)
+            if not isinstance(item, dict) or idx >= len(self._groups):
+                raise ValueError("unexpected decision item")
+            item = _validated_item(item)
+            _enrich_decision_item(item, self._groups[idx])
+        except Exception:
+            self._broken = True
+            return
+        item["parse_failed"] = False
+        self._items.append(item)
+
+
+async def _adecide_call(
+    chain: Any, system_message: Any, groups_data: List[DecisionGroup], group_dicts: List[Dict], stream: bool
+) -> _StreamingDecisions:
+    """One decision call (llm | StrOutputParser) for groups_data; with stream=True decisions are parsed while tokens arrive."""
+    messages = _decision_messages(system_message, group_dicts)
+    result = _StreamingDecisions(groups_data)
+    if stream:
+        async for chunk in chain.astream(messages):
+            result.feed(chunk)
+    else:
+        result.feed(await chain.ainvoke(messages))
+    return result
+
+
+async def _ainvoke_decision_batches(
+    chain: Any,
+    system_message: Any,
+    batches: List[Tuple[List[DecisionGroup], List[Dict]]],
+    max_concurrency: int,
+    stream: bool,
+) -> List[Any]:
+    """One LLM call per (groups, group dicts) batch, up to max_concurrency in flight; exceptions are returned, not raised."""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def decide(batch: Tuple[List[DecisionGroup], List[Dict]]) -> _StreamingDecisions:
+        groups, group_dicts = batch
+        async with semaphore:
+            return await _adecide_call(chain, system_message, groups, group_dicts, stream)
+
+    return await asyncio.gather(*(decide(batch) for batch in batches), return_exceptions=True)
+
+
+def _group_batches(groups_data: List[DecisionGroup], batch_size: int) -> List[List[int]]:
+    """
+    Split group indices into batches of at most batch_size. Groups are ordered by bill count first so each
+    batch holds similarly sized groups (similar output length, so concurrent calls finish close together).
+    """
+    order = sorted(
+        range(len(groups_data)),
+        key=lambda i: len(groups_data[i].valid_bills) + len(groups_data[i].invalid_bills),
+    )
+    return [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+_TRAILING_COMMA_RE = re.compile(r",\s*([\]}])")
 
 
 def _repair_json_string(s: str) -> str:
@@ -232,12 +426,12 @@ def _repair_json_string(s: str) -> str:
     if not s or not s.strip():
         return s
     t = s.strip()
-    # Trailing comma before ] or }
-    t = re.sub(r",\s*\]", "]", t)
-    t = re.sub(r",\s*}", "}", t)
+    # Trailing comma before ] or } (one pass for both)
+    t = _TRAILING_COMMA_RE.sub(r"\1", t)
     # Truncation: ends with comma or incomplete - close array/object
     if t.endswith(","):
         t = t[:-1].rstrip()
+    # str.count scans the compact (PEP 393) buffer in C; encoding to bytes first only adds a copy
     depth_a = t.count("[") - t.count("]")
     depth_b = t.count("{") - t.count("}")
     if depth_a > 0 or depth_b > 0:
@@ -245,63 +439,65 @@ def _repair_json_string(s: str) -> str:
     return t
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+# Characters that can change bracket/string state; a backslash is taken together with the character it escapes
+_BRACKET_TOKEN_RE = re.compile(r"\\.|[\"'\[\]]", re.DOTALL)
+
+
 def _find_balanced_array(s: str, start: int) -> Optional[str]:
     """Given index of '[' in s, return substring for the balanced [...] (or None)."""
     if start < 0 or start >= len(s) or s[start] != "[":
         return None
+    # The regex skips runs of ordinary characters in C; Python only sees quotes, brackets and escapes
     depth = 1
-    i = start + 1
-    in_string = False
-    escape = False
-    quote = None
-    while i < len(s) and depth > 0:
-        c = s[i]
-        if escape:
-            escape = False
-            i += 1
-            continue
-        if c == "\\" and in_string:
-            escape = True
-            i += 1
-            continue
-        if in_string:
-            if c == quote:
-                in_string = False
-            i += 1
-            continue
-        if c in ('"', "'"):
-            in_string = True
-            quote = c
-            i += 1
-            continue
-        if c == "[":
+    quote = None  # active string delimiter, None outside strings
+    for m in _BRACKET_TOKEN_RE.finditer(s, start + 1):
+        token = m.group()
+        if quote is not None:
+            if token == quote:
+                quote = None
+            continue  # escapes and brackets inside strings don't count
+        if len(token) == 2:
+            # Backslash outside a string is an ordinary character; the one after it is not escaped
+            token = token[1]
+        if token == "[":
             depth += 1
-        elif c == "]":
+        elif token == "]":
             depth -= 1
             if depth == 0:
-                return s[start : i + 1]
-        i += 1
+                return s[start : m.end()]
+        elif token in ('"', "'"):
+            quote = token
     return None
 
 
 def _extract_decisions_from_llm_output(output: str) -> Tuple[Optional[List[Dict]], Optional[str]]:
-    """Extract and parse decision list from LLM output. Tries extract -> parse -> repair -> parse.
+    """Extract and parse decision list from LLM output. Tries decode (with common fixes) -> raw_decode at the
+    decisions array -> bracket match + repair; the first stage that succeeds wins, nothing is parsed twice.
     Returns (raw_decisions_list, error_message). raw_decisions_list is None on total failure."""
     if not output or not isinstance(output, str):
         return None, "empty or invalid output"
-    data = None
-    json_str = _extract_json_from_llm_output(output)
-    if json_str:
-        try:
-            data = json.loads(json_str)
-        except (json.JSONDecodeError, TypeError, ValueError):
-            repaired = _repair_json_string(json_str)
-            try:
-                data = json.loads(repaired)
-            except (json.JSONDecodeError, TypeError, ValueError):
-                pass
+    data = _decode_json_from_llm_output(output)
     if data is None:
         # No JSON found by extractor or decode failed: try to find decisions array by bracket matching
+        brackets: List[int] = []
+        if '"decisions"' in output:
+            bracket = output.find("[", output.find('"decisions"'))
+            if bracket != -1:
+                brackets.append(bracket)
+        first_bracket = output.find("[")
+        if first_bracket != -1 and first_bracket not in brackets:
+            brackets.append(first_bracket)
+        # Well-formed array at the bracket: raw_decode locates and parses it in one C-level pass
+        for bracket in brackets:
+            try:
+                data = _JSON_DECODER.raw_decode(output, bracket)[0]
+                break
+            except ValueError:
+                continue
+    if data is None:
+        # Malformed array: cut it out by bracket matching, then parse/repair
         candidates: List[str] = []
         if '"decisions"' in output:
             idx = output.find('"decisions"')
@@ -318,14 +514,14 @@ def _extract_decisions_from_llm_output(output: str) -> Tuple[Optional[List[Dict]
                     candidates.append(candidate)
         for candidate in candidates:
             try:
-                data = json.loads(candidate)
+                data = json_loads(candidate)
                 break
-            except (json.JSONDecodeError, TypeError, ValueError):
+            except (ValueError, TypeError):
                 repaired = _repair_json_string(candidate)
                 try:
-                    data = json.loads(repaired)
+                    data = json_loads(repaired)
                     break
-                except (json.JSONDecodeError, TypeError, ValueError):
+                except (ValueError, TypeError):
                     continue
         else:
             data = None
@@ -378,25 +574,59 @@ def _report_parse_failure(
         print("--- End ---")
 
 
-def _make_parse_failed_placeholder(group: DecisionGroup) -> Dict[str, Any]:
-    """Build a decision item for a group that had no valid LLM decision (parse failed or count mismatch)."""
-    g = group.to_dict()
-    valid = g.get("valid_bills") or []
-    invalid = g.get("invalid_bills") or []
-    return {
+def _make_parse_failed_placeholder(group: DecisionGroup) -> EnrichedDecision:
+    """
+    Enriched REJECT decision for a group that had no valid LLM decision (parse failed or count mismatch).
+    Only the fields enrichment does not derive from the group are set up front.
+    """
+    item: EnrichedDecision = {
         "decision": "REJECT",
         "parse_failed": True,
-        "employee_id": g.get("employee_id", ""),
-        "employee_name": g.get("employee_name", ""),
-        "category": g.get("category", "unknown"),
-        "valid_bill_ids": list(valid),
-        "invalid_bill_ids": list(invalid),
-        "invalid_bill_reasons": [],
-        "claimed_amount": 0,
-        "approved_amount": 0,
-        "currency": g.get("currency", "INR"),
+        "employee_id": group.employee_id,
+        "employee_name": group.employee_name,
+        "valid_bill_ids": list(group.valid_bills or ()),
+        "invalid_bill_ids": list(group.invalid_bills or ()),
         "reasons": ["Decision output parse failed; sent to manual review."],
     }
+    _enrich_decision_item(item, group)
+    return item
+
+
+def _align_decisions(raw_decisions: List[Any], groups_data: List[DecisionGroup]) -> List[Optional[Dict]]:
+    """
+    Pair decisions with groups when the LLM returned more or fewer items than groups. Candidates must share
+    (employee_id, normalized category); among several, the group whose bill ids overlap the decision's most
+    wins (then a matching date). Groups left unpaired get None.
+    """
+    def key(employee_id: Any, category: Any) -> Tuple[str, str]:
+        return str(employee_id or "").strip(), _normalize_category(category)
+
+    unpaired: Dict[Tuple[str, str], List[int]] = {}
+    for i, group in enumerate(groups_data):
+        unpaired.setdefault(key(group.employee_id, group.category), []).append(i)
+    aligned: List[Optional[Dict]] = [None] * len(groups_data)
+    for item in raw_decisions:
+        if not isinstance(item, dict):
+            continue
+        candidates = unpaired.get(key(item.get("employee_id"), item.get("category")))
+        if not candidates:
+            continue
+        bill_ids = {
+            bid for bid in (*(item.get("valid_bill_ids") or ()), *(item.get("invalid_bill_ids") or ()))
+            if isinstance(bid, (str, int))
+        }
+        date = item.get("date")
+
+        def score(i: int) -> Tuple[int, bool]:
+            group = groups_data[i]
+            return len(bill_ids.intersection(group.valid_bills, group.invalid_bills)), date is not None and date == group.date
+
+        best = max(candidates, key=score)
+        if len(candidates) > 1 and score(best) == (0, False):
+            continue  # several days/groups for this employee+category and nothing tells them apart
+        candidates.remove(best)
+        aligned[best] = item
+    return aligned
 
 
 def _parse_and_enrich_decisions(
@@ -404,55 +634,49 @@ def _parse_and_enrich_decisions(
     groups_data: List[DecisionGroup],
     output_dir: Optional[str] = None,
     model_name: Optional[str] = None,
-) -> List[Dict]:
+) -> List[EnrichedDecision]:
     """Parse LLM output as JSON list and enrich each item. Uses repair/fallback parsing.
-    On full parse failure returns placeholders for all groups (parse_failed). On count mismatch or per-item failure: continue with parsed items and add parse_failed placeholders for missing/failed ones."""
+    On full parse failure returns placeholders for all groups (parse_failed). On count mismatch or per-item failure: continue with parsed items and add parse_failed placeholders for missing/failed ones.
+    Items that could only be paired by position on a count mismatch are marked paired_by_position."""
     raw_decisions, parse_error = _extract_decisions_from_llm_output(output)
     if raw_decisions is None:
         _report_parse_failure(output, parse_error or "unknown", output_dir, model_name)
         # Return one parse_failed placeholder per group so we still produce output (e.g. meal) instead of []
         print("📋 Using parse_failed placeholders for all groups (manual review).")
-        result: List[Dict] = []
-        for group in groups_data:
-            item = _make_parse_failed_placeholder(group)
-            _enrich_decision_item(item, group.to_dict())
-            item["parse_failed"] = True
-            result.append(item)
-        return result
+        return [_make_parse_failed_placeholder(group) for group in groups_data]
 
     n_groups = len(groups_data)
     n_parsed = len(raw_decisions)
+    positional = False
     if n_parsed != n_groups:
-        print(f"\n⚠️ Decision count mismatch: expected {n_groups} decision(s), got {n_parsed}. Filling missing with parse_failed placeholders.")
+        print(f"\n⚠️ Decision count mismatch: expected {n_groups} decision(s), got {n_parsed}. Realigning by employee/category/bills; unmatched groups get parse_failed placeholders.")
+        aligned = _align_decisions(raw_decisions, groups_data)
+        if any(item is not None for item in aligned):
+            raw_decisions = aligned
+        else:
+            # Nothing identifies the items (e.g. no employee_id): keep positional pairing
+            raw_decisions = (raw_decisions + [None] * n_groups)[:n_groups]
+            positional = True
 
-    result: List[Dict] = []
+    # Sequential on purpose: enrichment is pure-Python dict work (~12µs per group, 2000 groups in ~25ms),
+    # so a thread pool would only add GIL contention and executor overhead
+    result: List[EnrichedDecision] = []
     for i in range(n_groups):
         group = groups_data[i]
-        group_dict = group.to_dict()
-        if i >= n_parsed:
-            # No LLM decision for this group
-            item = _make_parse_failed_placeholder(group)
-            _enrich_decision_item(item, group_dict)
-            item["parse_failed"] = True
-            result.append(item)
-            continue
         item = raw_decisions[i]
         if not isinstance(item, dict):
-            item = _make_parse_failed_placeholder(group)
-            _enrich_decision_item(item, group_dict)
-            item["parse_failed"] = True
-            result.append(item)
+            result.append(_make_parse_failed_placeholder(group))
             continue
         try:
-            _enrich_decision_item(item, group_dict)
+            item = _validated_item(item)
+            _enrich_decision_item(item, group)
             item["parse_failed"] = False
+            if positional:
+                item["paired_by_position"] = True
             result.append(item)
         except Exception as e:
             print(f"⚠️ Enrich failed for group index {i} ({group.employee_id}/{group.category}): {e}. Using parse_failed placeholder.")
-            item = _make_parse_failed_placeholder(group)
-            _enrich_decision_item(item, group_dict)
-            item["parse_failed"] = True
-            result.append(item)
+            result.append(_make_parse_failed_placeholder(group))
 
     n_failed = sum(1 for r in result if r.get("parse_failed"))
     if n_failed:
@@ -460,6 +684,18 @@ def _parse_and_enrich_decisions(
     return result
 
 
+# Console echo of the raw decision output is capped; the full text goes to engine_raw_output*.txt
+RAW_OUTPUT_PRINT_CHARS: Final[int] = 2000
+
+
+def _print_raw_output(raw_output: str) -> None:
+    print("\n📄 Decision Output (raw):")
+    if len(raw_output) <= RAW_OUTPUT_PRINT_CHARS:
+        print(raw_output)
+    else:
+        print(f"{raw_output[:RAW_OUTPUT_PRINT_CHARS]}... ({len(raw_output)} chars; full text in engine raw output file)")
+
+
 def write_engine_output(
     raw_output: str,
     decisions: List[Dict],
@@ -499,16 +735,31 @@ class DecisionEngine:
         enable_rag: bool = False,
         policy_extractor: Optional[Any] = None,
         system_prompt_path: Optional[str] = None,
+        batch_size: int = 0,
+        max_concurrency: int = 4,
+        cache_path: Optional[str] = None,
+        stream: bool = False,
+        rule_fast_path: bool = False,
+        retry_missing: bool = False,
     ):
         self.model_name = model_name
+        # Groups per decision LLM call (0 = all groups in one call) and calls in flight when batching
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        # Stream LLM output and parse/enrich each decision as soon as it is complete
+        self.stream = stream
+        # Decide trivially decidable groups (see _try_rule_decide) without an LLM call
+        self.rule_fast_path = rule_fast_path
+        # Re-send groups the LLM left undecided (partial or unparseable response) once
+        self.retry_missing = retry_missing
+        # Optional exact-match cache: identical group + policy + prompt reuses the earlier decision
+        self.cache = DecisionCache(cache_path) if cache_path else None
         self.temperature = temperature
         self.output_dir = output_dir
         self.resources_dir = resources_dir
         self.enable_rag = enable_rag
         self.policy_extractor = policy_extractor
-        self._system_prompt_path = system_prompt_path or str(
-            _PROJECT_ROOT / "src" / "prompt" / "system_prompt_decision.txt"
-        )
+        self._system_prompt_path = system_prompt_path or project_path("src", "prompt", "system_prompt_decision.txt")
         self.llm = get_llm(
             model=self.model_name,
             temperature=self.temperature,
@@ -544,29 +795,9 @@ class DecisionEngine:
             groups_data, save_data, self.output_dir, self.model_name
         )
 
-        # 2. Engine: LLM + parse/enrich
-        system_prompt = self._load_system_prompt()
-        raw_output = _invoke_decision_llm(
-            self.llm, system_prompt, policy, groups_data, employee_org_data
-        )
-        print("\n📄 Decision Output (raw):")
-        print(raw_output)
-
-        decisions = _parse_and_enrich_decisions(
-            raw_output, groups_data,
-            output_dir=self.output_dir, model_name=self.model_name,
-        )
-        write_engine_output(raw_output, decisions, self.output_dir, self.model_name)
-
-        # 3. Post-processing: copy files (decision summary and artifacts written by app after all categories)
-        copy_files(
-            save_data,
-            self.output_dir,
-            self.model_name,
-            self.resources_dir,
-        )
-
-        return decisions
+        # 2–3. Engine (LLM + parse/enrich) and post-processing file copy; decision summary and artifacts
+        # are written by app after all categories
+        return self.run_with_prepared(groups_data, save_data, policy, employee_org_data)
 
     def run_with_prepared(
         self,
@@ -580,16 +811,35 @@ class DecisionEngine:
         If category is provided, engine raw output is written to engine_raw_output_{category}.txt."""
         if not groups_data:
             return []
-        system_prompt = self._load_system_prompt()
-        raw_output = _invoke_decision_llm(
-            self.llm, system_prompt, policy, groups_data, employee_org_data
-        )
-        print("\n📄 Decision Output (raw):")
-        print(raw_output)
-        decisions = _parse_and_enrich_decisions(
-            raw_output, groups_data,
-            output_dir=self.output_dir, model_name=self.model_name,
-        )
+        raw_output, decisions = self._decide(groups_data, policy, employee_org_data)
+        return self._write_and_copy(raw_output, decisions, save_data, category)
+
+    async def arun_with_prepared(
+        self,
+        groups_data: List[DecisionGroup],
+        save_data: List[Dict],
+        policy: Dict,
+        employee_org_data: Optional[Dict[str, Any]] = None,
+        category: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Async run_with_prepared, so several categories can be decided concurrently with asyncio.gather.
+        LLM calls are awaited on the caller's loop (no nested asyncio.run), so run it on the shared LLM loop:
+        run_on_llm_loop(...) from sync code. Output writes and file copies go to a worker thread.
+        """
+        if not groups_data:
+            return []
+        raw_output, decisions = await self._adecide(groups_data, policy, employee_org_data)
+        return await asyncio.to_thread(self._write_and_copy, raw_output, decisions, save_data, category)
+
+    def _write_and_copy(
+        self,
+        raw_output: str,
+        decisions: List[Dict],
+        save_data: List[Dict],
+        category: Optional[str],
+    ) -> List[Dict]:
+        """Write engine output and copy bill files to valid/invalid dirs; returns decisions."""
         write_engine_output(raw_output, decisions, self.output_dir, self.model_name, category=category)
         copy_files(
             save_data,
@@ -599,6 +849,171 @@ class DecisionEngine:
         )
         return decisions
 
+    def _decide(
+        self,
+        groups_data: List[DecisionGroup],
+        policy: Dict,
+        employee_org_data: Optional[Dict[str, Any]],
+    ) -> Tuple[str, List[Dict]]:
+        """_adecide from synchronous code, run on the shared LLM event loop (never a fresh asyncio.run())."""
+        return run_on_llm_loop(self._adecide(groups_data, policy, employee_org_data))
+
+    async def _adecide(
+        self,
+        groups_data: List[DecisionGroup],
+        policy: Dict,
+        employee_org_data: Optional[Dict[str, Any]],
+    ) -> Tuple[str, List[Dict]]:
+        """
+        Decisions for groups_data (in order): rule-decidable groups first (when rule_fast_path is on),
+        the rest via _adecide_llm. Returns (raw output for logging, decisions).
+        """
+        if not self.rule_fast_path:
+            return await self._adecide_llm(groups_data, policy, employee_org_data)
+        decisions: List[Optional[Dict]] = [_try_rule_decide(g) for g in groups_data]
+        pending = [i for i, d in enumerate(decisions) if d is None]
+        print(f"   ⚡ Rule fast-path: {len(groups_data) - len(pending)} of {len(groups_data)} group(s) decided without the LLM")
+        if not pending:
+            return "", decisions
+        raw_output, llm_decisions = await self._adecide_llm([groups_data[i] for i in pending], policy, employee_org_data)
+        for i, decision in zip(pending, llm_decisions):
+            decisions[i] = decision
+        return raw_output, decisions
+
+    async def _adecide_llm(
+        self,
+        groups_data: List[DecisionGroup],
+        policy: Dict,
+        employee_org_data: Optional[Dict[str, Any]],
+    ) -> Tuple[str, List[Dict]]:
+        """
+        LLM decisions for groups_data (in order): cached ones from the decision cache, the rest via
+        _adecide_uncached. New decisions are added to the cache unless they failed to parse or were only
+        paired with their group by position (they may belong to another group).
+        """
+        system_prompt = self._load_system_prompt()
+        if employee_org_data:
+            print("   📎 Using org data (employee/leave/manager) for enrichment")
+        # Each group is serialized once: the same dict feeds the cache key and the LLM payload
+        group_dicts = [g.to_dict() for g in groups_data]
+        if self.cache is None:
+            return await self._adecide_uncached(groups_data, group_dicts, system_prompt, policy, employee_org_data)
+
+        prefix = DecisionCache.key_prefix(self.model_name, self.temperature, system_prompt, policy)
+        keys = [DecisionCache.group_key(prefix, d, employee_org_data) for d in group_dicts]
+        cached = self.cache.get_many(keys)
+        decisions: List[Optional[Dict]] = [cached.get(k) for k in keys]
+        pending = [i for i, d in enumerate(decisions) if d is None]
+        if len(pending) < len(groups_data):
+            print(f"   ♻️ Decision cache: {len(groups_data) - len(pending)} of {len(groups_data)} group(s) reused")
+        if not pending:
+            return "", decisions
+
+        raw_output, new_decisions = await self._adecide_uncached(
+            [groups_data[i] for i in pending], [group_dicts[i] for i in pending],
+            system_prompt, policy, employee_org_data,
+        )
+        to_store: Dict[str, Dict] = {}
+        for i, decision in zip(pending, new_decisions):
+            decisions[i] = decision
+            if not decision.get("parse_failed") and not decision.get("paired_by_position"):
+                to_store[keys[i]] = decision
+        self.cache.put_many(to_store, self.model_name)
+        return raw_output, decisions
+
+    async def _adecide_uncached(
+        self,
+        groups_data: List[DecisionGroup],
+        group_dicts: List[Dict],
+        system_prompt: str,
+        policy: Dict,
+        employee_org_data: Optional[Dict[str, Any]],
+    ) -> Tuple[str, List[Dict]]:
+        """
+        _adecide_once for groups_data; with retry_missing, groups left parse_failed (missing from a partial
+        response or unparseable) are re-sent once in a smaller follow-up call.
+        """
+        raw_output, decisions = await self._adecide_once(groups_data, group_dicts, system_prompt, policy, employee_org_data)
+        failed = [i for i, d in enumerate(decisions) if d.get("parse_failed")]
+        if not self.retry_missing or not failed:
+            return raw_output, decisions
+        print(f"\n🔁 Retrying {len(failed)} undecided group(s)")
+        retry_raw, retried = await self._adecide_once(
+            [groups_data[i] for i in failed], [group_dicts[i] for i in failed],
+            system_prompt, policy, employee_org_data,
+        )
+        for i, decision in zip(failed, retried):
+            if not decision.get("parse_failed"):
+                decisions[i] = decision
+        return f"{raw_output}\n--- retry ---\n{retry_raw}", decisions
+
+    async def _adecide_once(
+        self,
+        groups_data: List[DecisionGroup],
+        group_dicts: List[Dict],
+        system_prompt: str,
+        policy: Dict,
+        employee_org_data: Optional[Dict[str, Any]],
+    ) -> Tuple[str, List[Dict]]:
+        """
+        LLM + parse/enrich for groups_data (group_dicts: their to_dict() payloads). With batch_size set, groups
+        are split into batches decided concurrently; each batch is parsed on its own and decisions are returned
+        in groups_data order.
+        """
+        system_message = _decision_system_message(system_prompt, policy, employee_org_data)
+        if self.batch_size <= 0 or len(groups_data) <= self.batch_size:
+            result = await _adecide_call(self._chain, system_message, groups_data, group_dicts, self.stream)
+            raw_output = result.raw
+            _print_raw_output(raw_output)
+            decisions = result.decisions() or _parse_and_enrich_decisions(
+                raw_output, groups_data,
+                output_dir=self.output_dir, model_name=self.model_name,
+            )
+            return raw_output, decisions
+
+        batches = _group_batches(groups_data, self.batch_size)
+        print(f"\n⚖️ Deciding {len(groups_data)} group(s) in {len(batches)} batch(es) of up to {self.batch_size}")
+        results = await _ainvoke_decision_batches(
+            self._chain, system_message,
+            [([groups_data[i] for i in batch], [group_dicts[i] for i in batch]) for batch in batches],
+            self.max_concurrency, self.stream,
+        )
+        decisions: List[Optional[Dict]] = [None] * len(groups_data)
+        raw_parts: List[str] = []
+        for n, (batch, result) in enumerate(zip(batches, results), start=1):
+            batch_decisions = None
+            if isinstance(result, BaseException):
+                print(f"❌ Decision batch {n} failed: {result}")
+                output = ""
+            else:
+                output = result.raw
+                batch_decisions = result.decisions()
+            raw_parts.append(f"--- batch {n} ---\n{output}")
+            if batch_decisions is None:
+                batch_decisions = _parse_and_enrich_decisions(
+                    output, [groups_data[i] for i in batch],
+                    output_dir=self.output_dir, model_name=self.model_name,
+                )
+            for i, decision in zip(batch, batch_decisions):
+                decisions[i] = decision
+        raw_output = "\n".join(raw_parts)
+        _print_raw_output(raw_output)
+        return raw_output, decisions
+
     def _load_system_prompt(self) -> str:
-        """Override to load prompt from another source (e.g. remote)."""
-        return FileUtils.load_text_file(self._system_prompt_path) or ""
+        """Override to load prompt from another source (e.g. remote). Re-read only when the file's mtime changes."""
+        return FileUtils.load_text_file_cached(self._system_prompt_path) or ""
+
+    @property
+    def llm(self) -> Any:
+        return self._llm
+
+    @llm.setter
+    def llm(self, llm: Any) -> None:
+        # The llm | StrOutputParser pipeline is composed once per model, not on every decision call
+        self._llm = llm
+        self._chain = llm | StrOutputParser()
+
+    def invalidate_prompt_cache(self) -> None:
+        """Drop cached system prompts so the next run re-reads the file even if its mtime is unchanged."""
+        FileUtils.clear_text_file_cache()
@@ -3,52 +3,60 @@
 from __future__ import annotations
 
 import csv
-import json
 import os
 import re
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from commons.utils import (
-    find_employee_resources_dir,
+    fast_copy,
+    files_matching_each,
+    json_dumps_bytes,
     normalize_category_for_path,
-    copy_files_matching,
 )
 
-_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+from app.extractors._paths import project_path
+
+# Trailing "(N%)" suffix appended to validation reasons
+_REASON_PCT_RE = re.compile(r"\s*\(\d+%\)\s*$")
 
 
 # -----------------------------------------------------------------------------
 # Summary helpers (from app)
 # -----------------------------------------------------------------------------
 
+@lru_cache(maxsize=2048)
+def _normalize_reason_text(reason: str) -> str:
+    return _REASON_PCT_RE.sub("", reason.strip()) or "Other"
+
+
 def normalize_reason(reason: str) -> str:
-    """Strip trailing (N%) and normalize empty to 'Other'."""
+    """Strip trailing (N%) and normalize empty to 'Other'. Memoized: the same few reasons repeat across decisions."""
     if not reason:
         return "Other"
-    return re.sub(r"\s*\(\d+%\)\s*$", "", str(reason).strip()) or "Other"
+    return _normalize_reason_text(str(reason))
 
 
 def consolidate_invalid_reasons(d: Dict) -> str:
     """Flatten error_summary to a single string for CSV (reason; reason (2); ...)."""
-    parts = []
-    for es in d.get("error_summary") or []:
-        reason = (es.get("reason") or "").strip() or "Other"
-        count = es.get("count") or len(es.get("bill_ids") or [])
-        parts.append(f"{reason} ({count})" if count > 1 else reason)
-    return "; ".join(parts)
+    return "; ".join(
+        f"{reason} ({count})" if count > 1 else reason
+        for reason, count in (
+            ((es.get("reason") or "").strip() or "Other", es.get("count") or len(es.get("bill_ids") or []))
+            for es in d.get("error_summary") or ()
+        )
+    )
+
+
+# LLM variants of the canonical categories (meal, commute, fuel); anything else passes through lowercased
+_CATEGORY_ALIASES = {"cab": "commute", "meals": "meal"}
 
 
 def _normalize_category(cat: str) -> str:
     """Canonical category for grouping: meal, commute, fuel. Handles LLM variants (Meal, cab, meals)."""
     c = (cat or "unknown").strip().lower()
-    if c in ("cab", "commute"):
-        return "commute"
-    if c in ("meal", "meals"):
-        return "meal"
-    if c == "fuel":
-        return "fuel"
-    return c
+    return _CATEGORY_ALIASES.get(c, c)
 
 
 def group_decisions(decisions: List[Dict]) -> Dict:
@@ -72,7 +80,8 @@ def build_summary_from_grouped(grouped: Dict) -> Dict:
             for month, items in by_month.items():
                 total_claimed = sum(float(d.get("claimed_amount") or 0) for d in items)
                 total_approved = sum(float(d.get("approved_amount") or 0) for d in items)
-                any_reject = any((d.get("decision") or "").upper() == "REJECT" for d in items)
+                # Normalized here too: decisions from external callers or older cache entries may be "reject" / " Reject "
+                any_reject = any((d.get("decision") or "").strip().upper() == "REJECT" for d in items)
                 currency = (items[0].get("currency") or "INR") if items else "INR"
                 valid_count = sum(len(d.get("valid_bill_ids") or []) for d in items)
                 invalid_count = sum(len(d.get("invalid_bill_ids") or []) for d in items)
@@ -111,6 +120,27 @@ def build_summary_from_grouped(grouped: Dict) -> Dict:
 FINAL_PROCESSED_INPUTS_DIR = "final_processed_inputs"
 
 
+@lru_cache(maxsize=1)
+def _copy_pool() -> ThreadPoolExecutor:
+    """One I/O pool for all bill copies in the process (copy_files runs once per category)."""
+    return ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix="bill-copy")
+
+
+def _list_dir(path: str) -> List[str]:
+    try:
+        return os.listdir(path)
+    except OSError:
+        return []
+
+
+def _folders_by_emp_id(names: List[str]) -> Dict[str, str]:
+    """Resources folders are named {emp_id}_{name}: map each emp_id to its first folder in listing order."""
+    index: Dict[str, str] = {}
+    for name in names:
+        index.setdefault(name.split("_", 1)[0], name)
+    return index
+
+
 def copy_files(
     save_data: List[Dict],
     output_dir: str,
@@ -119,32 +149,65 @@ def copy_files(
 ) -> None:
     """Copy bill files to valid/invalid dirs under model output: decisions/{model_name}/final_processed_inputs/{category}/."""
     print("\n📁 Copying files to valid/invalid directories...")
-    resources_root = os.path.join(str(_PROJECT_ROOT), resources_dir)
+    resources_root = project_path(resources_dir)
     # Place under model output: decisions/{model_name}/final_processed_inputs/{category}/valid_bills|invalid_bills
     base = os.path.join(output_dir, "decisions", model_name, FINAL_PROCESSED_INPUTS_DIR)
-    valid_base = os.path.join(base, "{category}", "valid_bills")
-    invalid_base = os.path.join(base, "{category}", "invalid_bills")
-
-    for emp in save_data:
+    # Per-category (valid dir, invalid dir, resources dir, resources listing, emp_id -> folder), built once
+    # per category rather than per employee (the listing replaces a listdir per employee)
+    category_dirs = {}
+    for category in {normalize_category_for_path(emp.get("category", "")) for emp in save_data}:
+        src_category = os.path.join(resources_root, category)
+        src_names = _list_dir(src_category)
+        category_dirs[category] = (
+            os.path.join(base, category, "valid_bills"),
+            os.path.join(base, category, "invalid_bills"),
+            src_category,
+            src_names,
+            _folders_by_emp_id(src_names),
+        )
+
+    def plan(emp: Dict) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """(src, dst) pairs for one employee (their dirs created) and the line to print once copied."""
         emp_id = emp.get("employee_id")
         emp_name = emp.get("employee_name")
         category = normalize_category_for_path(emp.get("category", ""))
         valid_files = emp.get("valid_files", [])
         invalid_files = emp.get("invalid_files", [])
 
-        emp_valid_dir = os.path.join(valid_base.format(category=category), f"{emp_id}_{emp_name}")
-        emp_invalid_dir = os.path.join(invalid_base.format(category=category), f"{emp_id}_{emp_name}")
+        valid_dir, invalid_dir, src_category, src_names, folder_index = category_dirs[category]
+        emp_valid_dir = os.path.join(valid_dir, f"{emp_id}_{emp_name}")
+        emp_invalid_dir = os.path.join(invalid_dir, f"{emp_id}_{emp_name}")
         os.makedirs(emp_valid_dir, exist_ok=True)
         os.makedirs(emp_invalid_dir, exist_ok=True)
 
-        src_category = os.path.join(resources_root, category)
-        resources_src_dir = find_employee_resources_dir(src_category, emp_id)
-        if not resources_src_dir:
-            continue
-
-        n_valid = copy_files_matching(resources_src_dir, emp_valid_dir, valid_files)
-        n_invalid = copy_files_matching(resources_src_dir, emp_invalid_dir, invalid_files)
-        print(f"✅ Copied {category} files for {emp_id}_{emp_name}: {n_valid} valid, {n_invalid} invalid")
+        # Exact emp_id folder from the index first, so E1 never picks E12_...; otherwise the first folder
+        # whose name starts with emp_id (find_employee_resources_dir's prefix rule, which ignores exact matches)
+        src_name = folder_index.get(emp_id) or next((name for name in src_names if name.startswith(emp_id)), None)
+        if src_name is None:
+            return [], None
+        resources_src_dir = os.path.join(src_category, src_name)
+
+        valid_matches, invalid_matches = files_matching_each(resources_src_dir, valid_files, invalid_files)
+        pairs = [(src, os.path.join(emp_valid_dir, name)) for src, name in valid_matches]
+        pairs.extend((src, os.path.join(emp_invalid_dir, name)) for src, name in invalid_matches)
+        return pairs, (
+            f"✅ Copied {category} files for {emp_id}_{emp_name}: {len(valid_matches)} valid, {len(invalid_matches)} invalid"
+        )
+
+    # Two phases on the shared I/O pool (makedirs, scandir and copies all release the GIL): plan every
+    # employee (disjoint dirs), then copy the full (src, dst) manifest. map() keeps save_data order for the
+    # printed lines, and neither phase waits on the pool from inside it.
+    copy_pairs: List[Tuple[str, str]] = []
+    copied: List[str] = []
+    for pairs, line in _copy_pool().map(plan, save_data):
+        copy_pairs.extend(pairs)
+        if line:
+            copied.append(line)
+
+    if copy_pairs:
+        list(_copy_pool().map(lambda pair: fast_copy(*pair), copy_pairs))
+    for line in copied:
+        print(line)
 
 
 # -----------------------------------------------------------------------------
@@ -165,33 +228,41 @@ def _normalize_decision_for_output(d: Dict) -> Dict:
     return out
 
 
-def _summary_to_csv_rows(summary: Dict) -> list:
-    """Flatten summary dict to rows for CSV: emp_key, category, month, decision, amounts, counts, confidence, manual_review, invalid_reasons."""
-    rows = []
-    for emp_key, by_cat in summary.items():
-        for category, by_month in by_cat.items():
-            for month, entry in by_month.items():
-                reasons_str = ""
-                if entry.get("invalid_reasons"):
-                    parts = [f"{r.get('reason', '')} ({r.get('count', 0)})" for r in entry["invalid_reasons"]]
-                    reasons_str = "; ".join(parts)
-                rows.append([
-                    emp_key,
-                    category,
-                    month,
-                    entry.get("decision", ""),
-                    entry.get("claimed_amount", 0),
-                    entry.get("approved_amount", 0),
-                    entry.get("currency", "INR"),
-                    entry.get("valid_bill_count", 0),
-                    entry.get("invalid_bill_count", 0),
-                    entry.get("period_count", 0),
-                    entry.get("min_confidence_score", ""),
-                    entry.get("manual_review", False),
-                    entry.get("parse_failed_count", 0),
-                    reasons_str,
-                ])
-    return rows
+def _invalid_reasons_cell(entry: Dict) -> str:
+    """Join summary invalid_reasons into one CSV cell: 'reason (count); ...'."""
+    return "; ".join(
+        f"{r.get('reason', '')} ({r.get('count', 0)})" for r in entry.get("invalid_reasons") or ()
+    )
+
+
+# One write syscall per 128 KiB of CSV rather than per default-sized (8 KiB) buffer
+CSV_WRITE_BUFFER = 128 * 1024
+
+
+def _summary_to_csv_rows(summary: Dict) -> Iterator[Tuple]:
+    """Flatten summary dict to rows for CSV: emp_key, category, month, decision, amounts, counts, confidence, manual_review, invalid_reasons.
+    Lazy, so writerows streams rows to the file instead of building the whole table first."""
+    return (
+        (
+            emp_key,
+            category,
+            month,
+            entry.get("decision", ""),
+            entry.get("claimed_amount", 0),
+            entry.get("approved_amount", 0),
+            entry.get("currency", "INR"),
+            entry.get("valid_bill_count", 0),
+            entry.get("invalid_bill_count", 0),
+            entry.get("period_count", 0),
+            entry.get("min_confidence_score", ""),
+            entry.get("manual_review", False),
+            entry.get("parse_failed_count", 0),
+            _invalid_reasons_cell(entry),
+        )
+        for emp_key, by_cat in summary.items()
+        for category, by_month in by_cat.items()
+        for month, entry in by_month.items()
+    )
 
 
 def write_decision_outputs(
@@ -212,13 +283,21 @@ def write_decision_outputs(
     grouped = group_decisions(decisions)
     summary = build_summary_from_grouped(grouped)
 
-    # Same level as preprocessing: by_employee; decisions use same amount fields as preprocessing (no claimed_amount)
+    # One pass over decisions: each is normalized once and filed under its employee in the all-categories
+    # view and in its category's view (same level as preprocessing; no claimed_amount)
     by_employee: Dict[str, Dict[str, Any]] = {}
+    by_category: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    count_by_cat: Dict[str, int] = {}
     for d in decisions:
         emp_key = f"{d.get('employee_id', '')}_{d.get('employee_name', '')}"
-        if emp_key not in by_employee:
-            by_employee[emp_key] = {"decisions": [], "summary": {}}
-        by_employee[emp_key]["decisions"].append(_normalize_decision_for_output(d))
+        out = _normalize_decision_for_output(d)
+        cat = out["category"]
+        count_by_cat[cat] = count_by_cat.get(cat, 0) + 1
+        for view in (by_employee, by_category.setdefault(cat, {})):
+            emp = view.get(emp_key)
+            if emp is None:
+                emp = view[emp_key] = {"decisions": [], "summary": {}}
+            emp["decisions"].append(out)
     for emp_key, emp_summary in summary.items():
         if emp_key not in by_employee:
             by_employee[emp_key] = {"decisions": [], "summary": {}}
@@ -239,31 +318,22 @@ def write_decision_outputs(
         "by_employee": by_employee,
     }
     output_path = os.path.join(out_dir, "postprocessing_output.json")
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2)
+    with open(output_path, "wb") as f:
+        f.write(json_dumps_bytes(output, indent=True))
     print(f"\n💾 Postprocessing output saved to: {output_path} (meta + decisions + summary)")
 
-    # Per-category postprocessing JSON (same structure, decisions filtered by category)
-    categories_seen = set(_normalize_category(d.get("category", "")) for d in decisions)
-    for cat in sorted(categories_seen):
+    # Per-category postprocessing JSON (same structure, decisions filtered by category). The summary is keyed
+    # employee -> category -> month, so each category's summary is a slice of the overall one, not recomputed.
+    for cat in sorted(by_category):
         if not cat or cat == "unknown":
             continue
-        decisions_cat = [d for d in decisions if _normalize_category(d.get("category", "")) == cat]
-        grouped_cat = group_decisions(decisions_cat)
-        summary_cat = build_summary_from_grouped(grouped_cat)
-        by_employee_cat: Dict[str, Dict[str, Any]] = {}
-        for d in decisions_cat:
-            emp_key = f"{d.get('employee_id', '')}_{d.get('employee_name', '')}"
-            if emp_key not in by_employee_cat:
-                by_employee_cat[emp_key] = {"decisions": [], "summary": {}}
-            by_employee_cat[emp_key]["decisions"].append(_normalize_decision_for_output(d))
+        by_employee_cat = by_category[cat]
+        summary_cat = {emp_key: {cat: summary[emp_key][cat]} for emp_key in by_employee_cat}
         for emp_key, emp_summary in summary_cat.items():
-            if emp_key not in by_employee_cat:
-                by_employee_cat[emp_key] = {"decisions": [], "summary": {}}
             by_employee_cat[emp_key]["summary"] = emp_summary
         meta_cat = {
-            "decision_count": len(decisions_cat),
-            "grouped_employee_count": len(grouped_cat),
+            "decision_count": count_by_cat[cat],
+            "grouped_employee_count": len(summary_cat),
             "summary_keys": list(summary_cat.keys()),
             "category": cat,
         }
@@ -273,12 +343,12 @@ def write_decision_outputs(
             "by_employee": by_employee_cat,
         }
         path_cat = os.path.join(out_dir, f"postprocessing_output_{cat}.json")
-        with open(path_cat, "w", encoding="utf-8") as f:
-            json.dump(output_cat, f, indent=2)
+        with open(path_cat, "wb") as f:
+            f.write(json_dumps_bytes(output_cat, indent=True))
         print(f"💾 Postprocessing output ({cat}) saved to: {path_cat}")
 
     summary_csv_path = os.path.join(out_dir, "postprocessing_summary.csv")
-    with open(summary_csv_path, "w", newline="", encoding="utf-8") as f:
+    with open(summary_csv_path, "w", newline="", encoding="utf-8", buffering=CSV_WRITE_BUFFER) as f:
         writer = csv.writer(f)
         writer.writerow([
             "emp_key", "category", "month", "decision", "claimed_amount", "approved_amount",
@@ -297,8 +367,8 @@ def write_decision_outputs(
         f.write("- **final_processed_inputs/** (sibling folder) – Valid and invalid bill files copied per category and employee: `decisions/{model}/final_processed_inputs/{category}/valid_bills/{emp_key}/` and `.../invalid_bills/{emp_key}/`.\n")
     if employee_org_data:
         org_path = os.path.join(out_dir, "employee_org_data.json")
-        with open(org_path, "w", encoding="utf-8") as f:
-            json.dump(employee_org_data, f, indent=2)
+        with open(org_path, "wb") as f:
+            f.write(json_dumps_bytes(employee_org_data, indent=True))
         print(f"💾 Employee org data (enrichment) saved to: {org_path}")
 
 
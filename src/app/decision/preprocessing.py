@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-import json
 import os
+from collections import defaultdict
+from itertools import chain
 from typing import Any, Dict, List, Optional, Tuple
 
 from commons.utils import (
     bill_amount,
     currency_from_bills,
-    daily_totals_from_bills,
+    json_dumps_bytes,
     month_from_bills,
     month_from_date_str,
 )
@@ -63,8 +64,9 @@ def _group_record(
     *,
     date: Optional[str],
     month: str,
-    valid_bills: List[Dict],
-    invalid_bills: List[Dict],
+    valid_ids: List[Any],
+    invalid_ids: List[Any],
+    invalid_bill_reasons: List[Dict],
     daily_total: Optional[float],
     monthly_total: Optional[float],
     currency: str,
@@ -76,15 +78,40 @@ def _group_record(
         category=category,
         date=date,
         month=month,
-        valid_bills=[b.get("id") for b in valid_bills],
-        invalid_bills=[b.get("id") for b in invalid_bills],
-        invalid_bill_reasons=_invalid_bill_reasons_from_bills(invalid_bills),
+        valid_bills=valid_ids,
+        invalid_bills=invalid_ids,
+        invalid_bill_reasons=invalid_bill_reasons,
         daily_total=daily_total,
         monthly_total=monthly_total,
         currency=currency,
     )
 
 
+class _Bucket:
+    """Bills of one group with ids, reasons, total and currency accumulated in the same pass."""
+
+    __slots__ = ("bills", "ids", "reasons", "total", "currency")
+
+    def __init__(self):
+        self.bills: List[Dict] = []
+        self.ids: List[Any] = []
+        self.reasons: List[Dict] = []
+        self.total = 0
+        self.currency: Optional[str] = None  # first non-empty currency of the valid bills
+
+    def add_valid(self, b: Dict) -> None:
+        self.bills.append(b)
+        self.ids.append(b.get("id"))
+        self.total += bill_amount(b)
+        if self.currency is None:
+            self.currency = (b.get("currency") or "").strip() or None
+
+    def add_invalid(self, b: Dict, reason: Dict) -> None:
+        self.bills.append(b)
+        self.ids.append(reason["bill_id"])
+        self.reasons.append(reason)
+
+
 def _groups_for_category(
     emp_id: str,
     emp_name: str,
@@ -93,39 +120,51 @@ def _groups_for_category(
     invalid_bills: List[Dict],
 ) -> List[DecisionGroup]:
     """Produce group record(s) for one employee+category: one per day for meal, else one per category."""
-    bills_for_currency = valid_bills or (valid_bills + invalid_bills)
-    group_currency = currency_from_bills(bills_for_currency) or "INR"
+    group_currency = currency_from_bills(valid_bills or invalid_bills) or "INR"
+    # Reasons depend only on each bill's validation: build them once per employee+category
+    invalid_reasons = _invalid_bill_reasons_from_bills(invalid_bills)
 
     if category == "meal":
-        daily_totals = daily_totals_from_bills(valid_bills)
-        if daily_totals:
+        # Bucket bills by date in one pass each (instead of re-filtering both lists per date)
+        valid_by_date: Dict[str, _Bucket] = defaultdict(_Bucket)
+        for b in valid_bills:
+            date = b.get("date")
+            if date is not None:
+                valid_by_date[date].add_valid(b)
+        if valid_by_date:
+            invalid_by_date: Dict[Optional[str], _Bucket] = defaultdict(_Bucket)
+            for b, reason in zip(invalid_bills, invalid_reasons):
+                invalid_by_date[b.get("date")].add_invalid(b, reason)
             result = []
-            for date, total in daily_totals.items():
-                date_bills = [b for b in valid_bills if b.get("date") == date]
-                inv_for_date = [b for b in invalid_bills if b.get("date") == date]
-                month = month_from_date_str(date) or month_from_bills(date_bills)
-                currency = currency_from_bills(date_bills) or group_currency
+            for date, valid in valid_by_date.items():
+                invalid = invalid_by_date.get(date) or _Bucket()
+                month = month_from_date_str(date) or month_from_bills(valid.bills)
+                currency = valid.currency or group_currency
                 result.append(_group_record(
                     emp_id,
                     emp_name,
                     category,
                     date=date,
                     month=month,
-                    valid_bills=date_bills,
-                    invalid_bills=inv_for_date,
-                    daily_total=total,
+                    valid_ids=valid.ids,
+                    invalid_ids=invalid.ids,
+                    invalid_bill_reasons=invalid.reasons,
+                    daily_total=valid.total,
                     monthly_total=None,
                     currency=currency,
                 ))
             return result
 
-    month = month_from_bills(valid_bills + invalid_bills)
-    monthly_total = sum(bill_amount(b) for b in valid_bills)
+    valid = _Bucket()
+    for b in valid_bills:
+        valid.add_valid(b)
+    month = month_from_bills(chain(valid_bills, invalid_bills))
     return [_group_record(
         emp_id, emp_name, category,
         date=None, month=month,
-        valid_bills=valid_bills, invalid_bills=invalid_bills,
-        daily_total=None, monthly_total=monthly_total,
+        valid_ids=valid.ids, invalid_ids=[r["bill_id"] for r in invalid_reasons],
+        invalid_bill_reasons=invalid_reasons,
+        daily_total=None, monthly_total=valid.total,
         currency=group_currency,
     )]
 
@@ -153,11 +192,13 @@ def filter_bills_by_category(
     """Restrict bills_map to bills whose category matches category_filter; drop empty employee lists."""
     if not category_filter:
         return bills_map
-    filtered = {
-        k: [b for b in v if (b.get("category") or "").strip().lower() == category_filter.lower()]
-        for k, v in bills_map.items()
-    }
-    return {k: v for k, v in filtered.items() if v}
+    wanted = category_filter.lower()
+    filtered: Dict[str, List[Dict]] = {}
+    for k, v in bills_map.items():
+        for b in v:
+            if (b.get("category") or "").strip().lower() == wanted:
+                filtered.setdefault(k, []).append(b)
+    return filtered
 
 
 def prepare_groups(bills_map: Dict[str, List[Dict]]) -> Tuple[List[DecisionGroup], List[Dict]]:
@@ -167,14 +208,16 @@ def prepare_groups(bills_map: Dict[str, List[Dict]]) -> Tuple[List[DecisionGroup
 
     for key, emp_bills in bills_map.items():
         emp_id, emp_name = key.split("_", 1)
-        category_groups: Dict[str, List[Dict]] = {}
+        category_groups: Dict[str, List[Dict]] = defaultdict(list)
         for b in emp_bills:
-            cat = b.get("category", "unknown")
-            category_groups.setdefault(cat, []).append(b)
+            category_groups[b.get("category", "unknown")].append(b)
 
         for category, cat_bills in category_groups.items():
-            valid_bills = [b for b in cat_bills if b.get("validation", {}).get("is_valid")]
-            invalid_bills = [b for b in cat_bills if not b.get("validation", {}).get("is_valid")]
+            valid_bills: List[Dict] = []
+            invalid_bills: List[Dict] = []
+            for b in cat_bills:
+                # is_valid read once per bill; a null validation counts as invalid
+                (valid_bills if (b.get("validation") or {}).get("is_valid") else invalid_bills).append(b)
 
             groups_data.extend(_groups_for_category(emp_id, emp_name, category, valid_bills, invalid_bills))
             save_data.append(_save_entry(emp_id, emp_name, category, valid_bills, invalid_bills))
@@ -203,17 +246,22 @@ def add_rag_context(
     policy_extractor: Optional[Any],
     enable_rag: bool,
 ) -> None:
-    """Attach RAG policy context to each group when policy_extractor and enable_rag are set."""
+    """Attach RAG policy context to each group when policy_extractor and enable_rag are set (one lookup per category)."""
     if not policy_extractor or not enable_rag or not hasattr(policy_extractor, "get_relevant_policy"):
         return
+    contexts: Dict[str, Optional[str]] = {}
     for group in groups_data:
-        try:
-            rag_context = policy_extractor.get_relevant_policy(group.category)
-            if rag_context:
-                group.rag_policy_context = rag_context
-                print(f"   📎 Added RAG context for {group.category}")
-        except Exception as e:
-            print(f"   ⚠️ Failed to get RAG context for {group.category}: {e}")
+        category = group.category
+        if category not in contexts:
+            try:
+                contexts[category] = policy_extractor.get_relevant_policy(category)
+                if contexts[category]:
+                    print(f"   📎 Added RAG context for {category}")
+            except Exception as e:
+                contexts[category] = None
+                print(f"   ⚠️ Failed to get RAG context for {category}: {e}")
+        if contexts[category]:
+            group.rag_policy_context = contexts[category]
 
 
 def run_preprocessing(
@@ -272,7 +320,7 @@ def write_preprocessing_output(
         "group_count": len(groups_data),
         "save_entries_count": len(save_data),
     }
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+    with open(path, "wb") as f:
+        f.write(json_dumps_bytes(payload, indent=True))
     print(f"\n📄 Pre-processing output saved to: {path} (once for all categories)")
     return path
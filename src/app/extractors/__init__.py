@@ -4,7 +4,7 @@ and registering with the registry.
 """
 
 from app.extractors.base import InvoiceExtractor, PolicyExtractor
-from app.extractors.base_extractor import BaseInvoiceExtractor
+from app.extractors.base_extractor import BaseInvoiceExtractor, run_batched
 from app.extractors.commute import CommuteExtractor
 from app.extractors.meal import MealExtractor
 from app.extractors.fuel import FuelExtractor
@@ -40,4 +40,5 @@ __all__ = [
     "EXTRACTOR_REGISTRY",
     "get_extractor",
     "register_extractor",
+    "run_batched",
 ]
@@ -3,101 +3,151 @@
 from __future__ import annotations
 
 import ast
-import json
+import asyncio
 import os
 import re
+from functools import lru_cache
+from typing import Any
+from langchain_core.messages import HumanMessage
 from langchain_core.output_parsers import BaseOutputParser, PydanticOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 
+from commons.config import config
 from commons.file_utils import FileUtils
-from commons.llm import get_llm, get_llm_model_name
+from commons.llm import cacheable_system_message, get_llm, get_llm_model_name, get_llm_provider, run_on_llm_loop
+from commons.utils import json_dumps, json_loads
 
 from app.extractors._paths import output_dir, project_path
+from app.extractors.cache import ExtractionCache
 from app.validation import get_validator
 
 
-def _extract_json_from_llm_output(text: str) -> str | None:
-    """Try to get valid JSON from LLM output (handles markdown code blocks, stray text, and common mistakes)."""
+# LLM output clean-up patterns, compiled once
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+_MISSING_KEY_QUOTE_RE = re.compile(r'(\{|,)\s*([a-zA-Z_][a-zA-Z0-9_]*)"\s*:')
+_SINGLE_QUOTED_KEY_RE = re.compile(r"'([^']*)'\s*:")
+_ARRAY_SPAN_RE = re.compile(r"\[[\s\S]*\]")
+_OBJECT_SPAN_RE = re.compile(r"\{[\s\S]*\}")
+
+
+def _from_literal(parsed: Any) -> Any:
+    """ast.literal_eval result as plain JSON data (tuples -> lists); TypeError if JSON can't represent it."""
+    return json_loads(json_dumps(parsed))
+
+
+def _decode_json_from_llm_output(text: str) -> Any:
+    """
+    Parsed JSON from LLM output (handles markdown code blocks, stray text, and common mistakes), or None.
+    Returns the decoded data itself so callers don't parse the same text a second time.
+    """
     if not text or not isinstance(text, str):
         return None
     s = text.strip()
     # Remove markdown code fences (e.g. ```json ... ``` or ``` ... ```)
     if "```" in s:
-        match = re.search(r"```(?:json)?\s*([\s\S]*?)```", s)
+        match = _CODE_FENCE_RE.search(s)
         if match:
             s = match.group(1).strip()
     # Try direct parse first
     try:
-        data = json.loads(s)
+        data = json_loads(s)
         # If result is a string (model wrapped output in quotes), try parsing as Python literal
         if isinstance(data, str) and data.strip().startswith(("[", "{")):
             try:
                 parsed = ast.literal_eval(data)
                 if isinstance(parsed, (list, dict)):
-                    return json.dumps(parsed)
+                    return _from_literal(parsed)
             except (ValueError, SyntaxError, TypeError):
                 pass
-        return s
-    except (json.JSONDecodeError, TypeError):
+        return data
+    except (ValueError, TypeError):
         pass
     # Fix common LLM mistakes: key missing opening quote (e.g. {filename": -> {"filename":)
     try:
-        fixed = re.sub(r'(\{|,)\s*([a-zA-Z_][a-zA-Z0-9_]*)"\s*:', r'\1"\2":', s)
+        fixed = _MISSING_KEY_QUOTE_RE.sub(r'\1"\2":', s)
         if fixed != s:
-            json.loads(fixed)
-            return fixed
-    except (json.JSONDecodeError, TypeError):
+            return json_loads(fixed)
+    except (ValueError, TypeError):
         pass
     # Single-quoted keys (Python-style) -> double quotes for JSON
     try:
-        fixed = re.sub(r"'([^']*)'\s*:", r'"\1":', s)
+        fixed = _SINGLE_QUOTED_KEY_RE.sub(r'"\1":', s)
         if fixed != s:
-            json.loads(fixed)
-            return fixed
-    except (json.JSONDecodeError, TypeError):
+            return json_loads(fixed)
+    except (ValueError, TypeError):
         pass
     # Python literal (single-quoted keys and values, e.g. [{'filename': 'x'}, ...])
     if s.startswith("[") or s.startswith("{"):
         try:
             parsed = ast.literal_eval(s)
             if isinstance(parsed, (list, dict)):
-                return json.dumps(parsed)
+                return _from_literal(parsed)
         except (ValueError, SyntaxError, TypeError):
             pass
     # Try to find a JSON array first (expected for meal/cab), then a single object
-    for pattern in (r"\[[\s\S]*\]", r"\{[\s\S]*\}"):
-        match = re.search(pattern, s)
+    for pattern in (_ARRAY_SPAN_RE, _OBJECT_SPAN_RE):
+        match = pattern.search(s)
         if match:
             candidate = match.group(0)
             try:
-                json.loads(candidate)
-                return candidate
-            except (json.JSONDecodeError, TypeError):
+                return json_loads(candidate)
+            except (ValueError, TypeError):
                 pass
             # Apply same fixes to the extracted candidate
             try:
-                fixed = re.sub(r'(\{|,)\s*([a-zA-Z_][a-zA-Z0-9_]*)"\s*:', r'\1"\2":', candidate)
+                fixed = _MISSING_KEY_QUOTE_RE.sub(r'\1"\2":', candidate)
                 if fixed != candidate:
-                    json.loads(fixed)
-                    return fixed
-            except (json.JSONDecodeError, TypeError):
+                    return json_loads(fixed)
+            except (ValueError, TypeError):
                 pass
             try:
-                fixed = re.sub(r"'([^']*)'\s*:", r'"\1":', candidate)
-                json.loads(fixed)
-                return fixed
-            except (json.JSONDecodeError, TypeError):
+                fixed = _SINGLE_QUOTED_KEY_RE.sub(r'"\1":', candidate)
+                return json_loads(fixed)
+            except (ValueError, TypeError):
                 pass
             # Last resort: Python literal (single quotes, True/False, etc.)
             try:
                 parsed = ast.literal_eval(candidate)
                 if isinstance(parsed, (list, dict)):
-                    return json.dumps(parsed)
+                    return _from_literal(parsed)
             except (ValueError, SyntaxError, TypeError):
                 continue
     return None
 
 
+# Columnar copy written next to each JSON output for fast --decision-only reloads (when pyarrow is installed)
+PARQUET_SUFFIX = ".parquet"
+
+
+_EXTRACTION_CFG = config.get("extraction") or {}
+# Extra LLM calls after an unparseable / schema-invalid response (the error is fed back to the model)
+PARSE_RETRIES = int(_EXTRACTION_CFG.get("parse_retries", 1))
+
+
+def _retry_feedback(error: Exception) -> HumanMessage:
+    """Follow-up turn asking the model to fix its previous answer."""
+    return HumanMessage(
+        content=(
+            f"Your previous answer could not be parsed: {error}\n"
+            "Return only the corrected JSON array that follows the schema, with no extra text."
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def _extraction_cache(cache_dir: str | None = None) -> ExtractionCache | None:
+    """Disk cache for extraction results; None unless cache_dir (or extraction.cache_dir) is set."""
+    cache_dir = cache_dir or _EXTRACTION_CFG.get("cache_dir")
+    if not cache_dir:
+        return None
+    return ExtractionCache(cache_dir if os.path.isabs(cache_dir) else project_path(cache_dir))
+
+
+@lru_cache(maxsize=1)
+def _shared_llm():
+    """One chat model client per process, shared by all extractors (connection pool reuse)."""
+    return get_llm()
+
+
 class _ListNormalizingParser(BaseOutputParser):
     """Wraps PydanticOutputParser: if LLM returns a single object, wrap it in a list before parsing."""
 
@@ -107,19 +157,18 @@ class _ListNormalizingParser(BaseOutputParser):
 
     def parse(self, text: str):
         raw = text.strip() if text else ""
-        json_str = _extract_json_from_llm_output(raw)
-        if json_str is None:
+        data = _decode_json_from_llm_output(raw)
+        if data is None:
             snippet = (raw[:200] + "…") if len(raw) > 200 else raw
             raise ValueError(
                 "Invalid JSON output from model. Response must be valid JSON (or JSON inside markdown code blocks). "
                 f"Got: {snippet!r}"
             )
         try:
-            data = json.loads(json_str)
             if isinstance(data, dict):
                 data = [data]
-            normalized = json.dumps(data)
-        except (json.JSONDecodeError, TypeError) as e:
+            normalized = json_dumps(data)
+        except (ValueError, TypeError) as e:
             snippet = (raw[:200] + "…") if len(raw) > 200 else raw
             raise ValueError(
                 f"Invalid JSON output from model: {e}. Response snippet: {snippet!r}"
@@ -130,6 +179,13 @@ class _ListNormalizingParser(BaseOutputParser):
         return self._parser.get_format_instructions()
 
 
+@lru_cache(maxsize=None)
+def _parser_for(schema_class: type) -> tuple[_ListNormalizingParser, str]:
+    """Stateless parser + its format-instructions text, built once per schema class (schemas are static)."""
+    parser = _ListNormalizingParser(schema_class)
+    return parser, parser.get_format_instructions()
+
+
 class BaseInvoiceExtractor:
     """
     Shared logic for folder-based invoice extractors (commute, meal, fuel).
@@ -137,6 +193,8 @@ class BaseInvoiceExtractor:
     and optionally override _extra_init() and _validation_context().
     """
 
+    cache: ExtractionCache | None = None
+
     def __init__(
         self,
         input_folder: str,
@@ -146,6 +204,7 @@ class BaseInvoiceExtractor:
         schema_class: type,
         system_prompt_path: str | None = None,
         policy: dict | None = None,
+        cache_dir: str | None = None,
     ):
         self.input_folder = input_folder
         self.policy = policy
@@ -155,29 +214,30 @@ class BaseInvoiceExtractor:
         self.output_folder = output_dir(category, get_llm_model_name())
         self.employee_meta = FileUtils.extract_info_from_foldername(self.input_folder)
         self.category = {"category": category}
+        # Folder-level fields merged into every extracted bill (identical for all bills in the folder)
+        self._bill_meta = {**self.employee_meta.to_dict(), **self.category}
         self.receipts = FileUtils.process_folder(self.input_folder)
         print("\n[Receipts loaded]")
 
-        self.ocr_lookup = {}
-        for rec in self.receipts:
-            for filename, ocr_text in rec.items():
-                self.ocr_lookup[filename] = ocr_text
+        self.ocr_lookup = {filename: ocr_text for rec in self.receipts for filename, ocr_text in rec.items()}
 
-        self.system_prompt = FileUtils.load_text_file(self.system_prompt_path)
+        self.system_prompt = FileUtils.load_text_file_cached(self.system_prompt_path)
         print("\n[Loaded System Prompt]")
 
-        self.llm = get_llm()
-        self.parser = _ListNormalizingParser(schema_class)
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", "{system_prompt}"),
-            (
-                "human",
-                "Here are the receipts:\n{receipts_json}\n\nOutput must follow this JSON schema:\n{format_instructions}",
-            ),
-        ])
-        # OpenAI/Groq function-calling and native response_format both require top-level type "object".
-        # Our schemas are RootModel[list[...]] (array), so we always use prompt + parser (no with_structured_output).
-        self.chain = self.prompt | self.llm | self.parser
+        self.llm = _shared_llm()
+        self.cache = _extraction_cache(cache_dir)
+        self.schema_class = schema_class
+        self.parser, format_instructions = _parser_for(schema_class)
+        # All static text (instructions + schema) goes first so providers can cache the prompt prefix;
+        # only the receipts vary between calls.
+        self._static_system = (
+            f"{self.system_prompt or ''}\n\nOutput must follow this JSON schema:\n{format_instructions}"
+        )
+        # Messages are built directly (no prompt template): the receipts JSON is never scanned for {placeholders}
+        self._system_message = cacheable_system_message(self._static_system)
+        # OpenAI/Groq function-calling and native response_format (incl. json_mode) require top-level type "object".
+        # Our schemas are RootModel[list[...]] (array), so we always use messages + parser (no with_structured_output)
+        # and re-ask with the parse error on failure (see _extract).
         self._use_structured_output = False
         self._extra_init()
 
@@ -193,14 +253,10 @@ class BaseInvoiceExtractor:
 
     def _enrich(self, base: dict) -> dict:
         """Build enriched bill with ocr, employee_meta, category."""
-        filename = base.get("filename")
-        ocr_text = self.ocr_lookup.get(filename)
-        return {
-            **base,
-            "ocr": ocr_text,
-            **self.employee_meta.to_dict(),
-            **self.category,
-        }
+        enriched = dict(base)
+        enriched["ocr"] = self.ocr_lookup.get(base.get("filename"))
+        enriched.update(self._bill_meta)
+        return enriched
 
     def _validate(self, enriched: dict) -> dict:
         """Run registered validator for this category."""
@@ -209,33 +265,264 @@ class BaseInvoiceExtractor:
             return {}
         return validator.validate(enriched, context=self._validation_context())
 
-    def run(self, save_to_file: bool = True) -> list[dict]:
+    def _messages(self, receipts: list[dict]) -> list:
+        return [self._system_message, HumanMessage(content=f"Here are the receipts:\n{receipts}")]
+
+    @staticmethod
+    def _to_items(result) -> list[dict]:
+        """Chain result (RootModel or list) -> list of plain dicts."""
+        # Parser path returns RootModel; structured-output path may return RootModel or list
+        output_data = result.root if hasattr(result, "root") else result
+        if not isinstance(output_data, list):
+            output_data = list(output_data) if output_data else []
+        return [item.model_dump() if hasattr(item, "model_dump") else item for item in output_data]
+
+    def _cached_items(self, receipts: list[dict]) -> tuple[str | None, list[dict] | None]:
+        """(cache key, cached items) for receipts; key is None when caching is off, items None on a miss."""
+        if self.cache is None:
+            return None, None
+        key = ExtractionCache.key(
+            get_llm_model_name(),
+            str((config.get("llm") or {}).get("temperature")),
+            self._static_system,
+            ExtractionCache.receipts_key_part(receipts),
+        )
+        items = self.cache.get(key)
+        if items is not None:
+            try:
+                items = self._to_items(self.schema_class.model_validate(items))
+            except ValueError:
+                items = None
+        return key, items
+
+    def _store_items(self, key: str | None, items: list[dict]) -> None:
+        if key is not None:
+            self.cache.put(key, items, model=get_llm_model_name(), provider=get_llm_provider())
+
+    def _extract(self, receipts: list[dict]) -> list[dict]:
+        """Extracted items for receipts ([{filename: ocr_text}, ...]), from the disk cache when enabled."""
+        key, items = self._cached_items(receipts)
+        if items is None:
+            items = self._invoke_llm(receipts)
+            self._store_items(key, items)
+        return items
+
+    async def _aextract(self, receipts: list[dict]) -> list[dict]:
+        """Async variant of _extract so several batches can be in flight at once."""
+        key, items = self._cached_items(receipts)
+        if items is None:
+            items = await self._ainvoke_llm(receipts)
+            self._store_items(key, items)
+        return items
+
+    def _invoke_llm(self, receipts: list[dict]) -> list[dict]:
+        """
+        Invoke the LLM on receipts and return extracted items as dicts.
+        If the reply does not parse against the schema, re-ask up to PARSE_RETRIES times with the error.
+        """
+        messages = self._messages(receipts)
+        for attempt in range(PARSE_RETRIES + 1):
+            reply = self.llm.invoke(messages)
+            try:
+                return self._to_items(self.parser.invoke(reply))
+            except ValueError as e:
+                if attempt == PARSE_RETRIES:
+                    raise
+                print(f"⚠️ Unparseable extraction output, retrying ({attempt + 1}/{PARSE_RETRIES}): {e}")
+                messages = [*messages, reply, _retry_feedback(e)]
+        return []
+
+    async def _ainvoke_llm(self, receipts: list[dict]) -> list[dict]:
+        """Async variant of _invoke_llm (llm.ainvoke)."""
+        messages = self._messages(receipts)
+        for attempt in range(PARSE_RETRIES + 1):
+            reply = await self.llm.ainvoke(messages)
+            try:
+                return self._to_items(self.parser.invoke(reply))
+            except ValueError as e:
+                if attempt == PARSE_RETRIES:
+                    raise
+                print(f"⚠️ Unparseable extraction output, retrying ({attempt + 1}/{PARSE_RETRIES}): {e}")
+                messages = [*messages, reply, _retry_feedback(e)]
+        return []
+
+    def _finalize(self, items: list[dict], save_to_file: bool = True) -> list[dict]:
+        """Enrich and validate extracted items for this folder; optionally save them."""
+        validated_results = [self._enrich(base) for base in items]
+        validator = get_validator(self.validator_category)
+        validate_many = getattr(validator, "validate_many", None)
+        if validate_many is not None:
+            # Batch-capable validators (e.g. rides: one fuzzy-match call for the whole folder)
+            for enriched, validation in zip(
+                validated_results, validate_many(validated_results, context=self._validation_context())
+            ):
+                enriched["validation"] = validation
+        else:
+            for enriched in validated_results:
+                enriched["validation"] = self._validate(enriched)
+
+        if save_to_file:
+            folder_name = os.path.basename(self.input_folder.rstrip(os.sep))
+            out_path = os.path.join(self.output_folder, folder_name)
+            # Pass the list straight through: the writer serializes once (orjson when installed)
+            FileUtils.write_json_to_file(validated_results, out_path)
+            FileUtils.write_bills_parquet(validated_results, out_path + PARQUET_SUFFIX)
+        return validated_results
+
+    def run(
+        self,
+        save_to_file: bool = True,
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[dict]:
+        """
+        Extract, enrich, validate and (optionally) save this folder's bills.
+        Folders with more than batch_size receipts (default: extraction.batch_size) are split into
+        concurrent shards via run_batched; if any shard fails the folder is not saved, so a partial
+        list never replaces its previous output.
+        """
+        if batch_size is None:
+            batch_size = int(_EXTRACTION_CFG.get("batch_size", 0) or 0)
+        if 0 < batch_size < len(self.receipts):
+            if max_concurrency is None:
+                max_concurrency = int(_EXTRACTION_CFG.get("max_concurrency", 4))
+            return run_batched([self], batch_size, save_to_file, max_concurrency)
+
         print("\n[Starting Extraction]\n")
         try:
-            result = self.chain.invoke({
-                "system_prompt": self.system_prompt,
-                "receipts_json": self.receipts,
-                "format_instructions": self.parser.get_format_instructions(),
-            })
-            # Parser path returns RootModel; structured-output path may return RootModel or list
-            output_data = result.root if hasattr(result, "root") else result
-            if not isinstance(output_data, list):
-                output_data = list(output_data) if output_data else []
+            output_data = self._extract(self.receipts)
             print("\n✔ Batch Extracted Successfully")
-
-            validated_results = []
-            for item in output_data:
-                base = item.model_dump() if hasattr(item, "model_dump") else item
-                enriched = self._enrich(base)
-                enriched["validation"] = self._validate(enriched)
-                validated_results.append(enriched)
-
-            if save_to_file:
-                folder_name = os.path.basename(self.input_folder.rstrip(os.sep))
-                out_path = os.path.join(self.output_folder, folder_name)
-                json_output = json.dumps(validated_results, indent=4, ensure_ascii=False)
-                FileUtils.write_json_to_file(json_output, out_path)
-            return validated_results
+            return self._finalize(output_data, save_to_file)
         except Exception as e:
             print(f"❌ Error during batch extraction: {e}")
             return []
+
+
+def _receipt_batches(
+    extractors: list[BaseInvoiceExtractor], batch_size: int
+) -> list[tuple[list[dict], dict[str, BaseInvoiceExtractor]]]:
+    """
+    Group receipts from all extractors into batches of at most batch_size.
+    Each batch carries filename -> owning extractor; a batch never holds the same filename twice.
+    """
+    batches = []
+    receipts: list[dict] = []
+    owners: dict[str, BaseInvoiceExtractor] = {}
+    for extractor in extractors:
+        for rec in extractor.receipts:
+            if len(receipts) >= batch_size or any(name in owners for name in rec):
+                batches.append((receipts, owners))
+                receipts, owners = [], {}
+            receipts.append(rec)
+            for name in rec:
+                owners[name] = extractor
+    if receipts:
+        batches.append((receipts, owners))
+    return batches
+
+
+def _route_items(
+    items: list[dict], owners: dict[str, BaseInvoiceExtractor]
+) -> list[tuple[BaseInvoiceExtractor, dict]] | None:
+    """(owner, item) for each extracted item by its filename; None if any item can't be placed."""
+    batch_owners = set(owners.values())
+    single_owner = next(iter(batch_owners)) if len(batch_owners) == 1 else None
+    routed = []
+    for item in items:
+        owner = owners.get(item.get("filename")) or single_owner
+        if owner is None:
+            return None
+        routed.append((owner, item))
+    return routed
+
+
+def _split_by_owner(
+    receipts: list[dict], owners: dict[str, BaseInvoiceExtractor]
+) -> list[tuple[list[dict], dict[str, BaseInvoiceExtractor]]]:
+    """One single-folder batch per owner, receipts kept in order."""
+    split: dict[BaseInvoiceExtractor, tuple[list[dict], dict[str, BaseInvoiceExtractor]]] = {}
+    for rec in receipts:
+        owner = owners[next(iter(rec))]
+        part = split.setdefault(owner, ([], {}))
+        part[0].append(rec)
+        for name in rec:
+            part[1][name] = owner
+    return list(split.values())
+
+
+async def _aextract_batches(
+    runner: BaseInvoiceExtractor, batches: list, max_concurrency: int
+) -> list:
+    """Run all batches through runner._aextract concurrently; exceptions are returned, not raised."""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def extract(receipts: list[dict]):
+        async with semaphore:
+            return await runner._aextract(receipts)
+
+    return await asyncio.gather(*(extract(receipts) for receipts, _ in batches), return_exceptions=True)
+
+
+def run_batched(
+    extractors: list[BaseInvoiceExtractor],
+    batch_size: int,
+    save_to_file: bool = True,
+    max_concurrency: int = 4,
+) -> list[dict]:
+    """
+    Extract receipts from several folders of one category with up to batch_size receipts per LLM call.
+    Up to max_concurrency calls are in flight at once. Extracted items are routed back to their folder
+    by filename (a mixed batch that can't be routed is re-extracted per folder), then each folder is
+    enriched, validated and saved exactly as in BaseInvoiceExtractor.run. A folder with any failed batch
+    is reported and skipped, so its previous output is left untouched.
+    """
+    if not extractors:
+        return []
+    runner = extractors[0]
+    batches = _receipt_batches(extractors, max(1, batch_size))
+    items_by_extractor: dict[BaseInvoiceExtractor, list[dict]] = {e: [] for e in extractors}
+    failed: set = set()
+
+    print(f"\n[Starting Extraction] {len(batches)} batch(es) of up to {batch_size} receipts\n")
+    # On the shared LLM loop, not a fresh asyncio.run(): the shared client's pooled connections outlive this call
+    outcomes = run_on_llm_loop(_aextract_batches(runner, batches, max_concurrency))
+    # Mixed-folder batches with an item that can't be routed back by filename are re-extracted one folder
+    # at a time (routing is then trivial), so no receipt is silently dropped
+    retry_batches: list[tuple[list[dict], dict[str, BaseInvoiceExtractor]]] = []
+    for (receipts, owners), items in zip(batches, outcomes):
+        if isinstance(items, BaseException):
+            print(f"❌ Error during batch extraction: {items}")
+            failed.update(owners.values())
+            continue
+        routed = _route_items(items, owners)
+        if routed is None:
+            print("⚠️ Could not route every extracted item back to a folder; re-extracting the batch per folder")
+            retry_batches.extend(_split_by_owner(receipts, owners))
+            continue
+        for owner, item in routed:
+            items_by_extractor[owner].append(item)
+        print(f"\n✔ Batch Extracted Successfully ({len(receipts)} receipts)")
+
+    if retry_batches:
+        retry_outcomes = run_on_llm_loop(_aextract_batches(runner, retry_batches, max_concurrency))
+        for (receipts, owners), items in zip(retry_batches, retry_outcomes):
+            owner = next(iter(owners.values()))
+            if isinstance(items, BaseException):
+                print(f"❌ Error during batch extraction: {items}")
+                failed.add(owner)
+                continue
+            items_by_extractor[owner].extend(items)
+            print(f"\n✔ Batch Extracted Successfully ({len(receipts)} receipts)")
+
+    results: list[dict] = []
+    for extractor in extractors:
+        if extractor in failed:
+            # Any failed batch fails the whole folder: saving the rest would overwrite its output with a
+            # partial list (and the decision engine would under-count that month)
+            print(f"❌ Extraction failed for {extractor.input_folder}; nothing saved for this folder")
+            continue
+        try:
+            results.extend(extractor._finalize(items_by_extractor[extractor], save_to_file))
+        except Exception as e:
+            print(f"❌ Error during batch extraction for {extractor.input_folder}: {e}")
+    return results
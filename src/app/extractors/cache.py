@@ -0,0 +1,63 @@
+"""Content-addressed disk cache for LLM extraction results (opt-in via extraction.cache_dir)."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from commons.file_utils import FileUtils
+from commons.utils import json_dumps_bytes, json_loads
+
+
+class ExtractionCache:
+    """
+    One JSON file per key under cache_dir. The key hashes everything that determines the LLM answer
+    (model, temperature, system prompt, receipts), so unchanged receipts skip the LLM call on re-runs.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(*parts: str | bytes) -> str:
+        """blake2b-128 over length-prefixed parts (so ("ab", "c") and ("a", "bc") never collide)."""
+        h = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            data = part.encode("utf-8") if isinstance(part, str) else part
+            h.update(len(data).to_bytes(8, "little"))
+            h.update(data)
+        return h.hexdigest()
+
+    @staticmethod
+    def receipts_key_part(receipts: list[dict]) -> bytes:
+        return json_dumps_bytes(receipts, sort_keys=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> list[dict] | None:
+        """Cached items for key, or None on miss / unreadable entry."""
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = json_loads(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable extraction cache entry {key}: {e}")
+            return None
+        items = entry.get("items") if isinstance(entry, dict) else None
+        return items if isinstance(items, list) else None
+
+    def put(self, key: str, items: list[dict], **meta) -> None:
+        """Store items with metadata (written to a temp file, then renamed, so readers never see partial JSON)."""
+        entry = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **meta,
+            "items": items,
+        }
+        try:
+            FileUtils.write_bytes_atomic(self._path(key), json_dumps_bytes(entry))
+        except Exception as e:
+            print(f"⚠️ Could not write extraction cache entry {key}: {e}")
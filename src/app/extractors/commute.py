@@ -1,14 +1,31 @@
 """Commute (cab) invoice extractor. Implements InvoiceExtractor."""
 
-import json
+import os
+from functools import lru_cache
 
 from commons.config import config
+from commons.utils import json_loads
 from entity.ride_extraction_schema import RideExtractionList
 
 from app.extractors._paths import project_path
 from app.extractors.base_extractor import BaseInvoiceExtractor
 
 
+@lru_cache(maxsize=4)
+def _load_clients(path: str, mtime: float) -> dict[str, list[str]]:
+    """Parse clients.json once per (path, mtime) and normalize it: client upper-case, addresses lower-case."""
+    with open(path, "rb") as f:
+        raw = json_loads(f.read())
+    return {k.upper(): [a.lower() for a in v] for k, v in raw.items()}
+
+
+def _client_addresses() -> dict[str, list[str]]:
+    """Client addresses for RideValidator; re-read only when clients.json changes on disk."""
+    clients_file = (config.get("paths") or {}).get("clients_file", "clients.json")
+    path = project_path(clients_file)
+    return _load_clients(path, os.path.getmtime(path))
+
+
 class CommuteExtractor(BaseInvoiceExtractor):
     """Extract and validate cab/commute invoices from a folder."""
 
@@ -24,10 +41,7 @@ class CommuteExtractor(BaseInvoiceExtractor):
         )
 
     def _extra_init(self) -> None:
-        clients_file = (config.get("paths") or {}).get("clients_file", "clients.json")
-        clients_path = project_path(clients_file)
-        with open(clients_path, "r", encoding="utf-8") as f:
-            self.client_addresses = json.load(f)
+        self.client_addresses = _client_addresses()
 
     def _validation_context(self) -> dict:
         ctx = super()._validation_context()
@@ -4,8 +4,8 @@ import json
 import os
 
 import httpx
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 
 from commons.file_utils import FileUtils
 from commons.config import config
@@ -41,12 +41,9 @@ class PolicyExtractor:
         print("\n[Loaded System Prompt]")
 
         llm = get_llm(http_client=httpx.Client(verify=False))
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "{system_prompt}"),
-            ("human", "{ocr_text}"),
-        ])
-        chain = prompt | llm | StrOutputParser()
-        output = chain.invoke({"system_prompt": system_prompt, "ocr_text": ocr_text})
+        # Direct messages (no prompt template): the OCR text is never scanned for {placeholders}
+        messages = [SystemMessage(content=system_prompt or ""), HumanMessage(content=str(ocr_text))]
+        output = (llm | StrOutputParser()).invoke(messages)
 
         print("\n📄 Policy Output:")
         print(output)
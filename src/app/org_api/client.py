@@ -4,8 +4,10 @@ Configure in config.yaml under org_api. When disabled or on failure, returns Non
 """
 
 import os
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
+import httpx
 import requests
 
 from commons.config import config
@@ -19,8 +21,9 @@ def is_org_api_enabled() -> bool:
     return bool(_org_api_config().get("enabled", False))
 
 
+@lru_cache(maxsize=1)
 def get_org_client() -> Optional["OrgApiClient"]:
-    """Return an OrgApiClient if org_api is enabled and configured, else None."""
+    """Return an OrgApiClient if org_api is enabled and configured, else None. One shared instance per process."""
     if not is_org_api_enabled():
         return None
     cfg = _org_api_config()
@@ -53,6 +56,8 @@ class OrgApiClient:
         self.api_key = api_key
         self.timeout = timeout
         self.employee_path_template = employee_path_template
+        # employee_id -> normalized details (successful lookups only; failures are retried)
+        self._details_cache: Dict[str, Dict[str, Any]] = {}
 
     def _headers(self) -> Dict[str, str]:
         h = {"Accept": "application/json", "Content-Type": "application/json"}
@@ -68,15 +73,47 @@ class OrgApiClient:
         """
         if not employee_id:
             return None
+        cached = self._details_cache.get(employee_id)
+        if cached is not None:
+            return cached
         path = self.employee_path_template.format(employee_id=employee_id)
         url = f"{self.base_url}{path}"
         try:
             resp = requests.get(url, headers=self._headers(), timeout=self.timeout)
             resp.raise_for_status()
             data = resp.json()
-            return self._normalize_employee_response(data, employee_id)
+            details = self._normalize_employee_response(data, employee_id)
         except Exception:
             return None
+        self._details_cache[employee_id] = details
+        return details
+
+    async def aget_employee_details(
+        self, employee_id: str, client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of get_employee_details. Pass a shared httpx.AsyncClient to reuse connections
+        across many employees; otherwise a short-lived client is used. Returns None on any failure.
+        """
+        if not employee_id:
+            return None
+        cached = self._details_cache.get(employee_id)
+        if cached is not None:
+            return cached
+        path = self.employee_path_template.format(employee_id=employee_id)
+        url = f"{self.base_url}{path}"
+        try:
+            if client is None:
+                async with httpx.AsyncClient(timeout=self.timeout) as own_client:
+                    resp = await own_client.get(url, headers=self._headers())
+            else:
+                resp = await client.get(url, headers=self._headers(), timeout=self.timeout)
+            resp.raise_for_status()
+            details = self._normalize_employee_response(resp.json(), employee_id)
+        except Exception:
+            return None
+        self._details_cache[employee_id] = details
+        return details
 
     def _normalize_employee_response(self, data: Dict[str, Any], employee_id: str) -> Dict[str, Any]:
         """
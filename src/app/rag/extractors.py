@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
 from typing import Any, Dict, Optional
 
 from app.extractors._paths import project_path
+from commons.file_utils import FileUtils
+from commons.utils import json_dumps_bytes, json_loads
 from app.extractors.policy_extractor import PolicyExtractor as BasePolicyExtractor
 
 
@@ -20,6 +23,54 @@ class RAGPolicyExtractor:
         self.config = config
         self.vector_store = None
         self.embeddings = None
+        # category -> retrieved policy text; the policy is fixed for the extractor's lifetime
+        self._category_context: Dict[str, str] = {}
+        self._rag_unavailable = False
+        # Optional cross-run cache of retrieved context, valid only for this policy text + retrieval settings
+        cache_path = getattr(config, "rag_cache_path", None)
+        self._cache_path = project_path(cache_path) if cache_path else None
+        self._policy_hash = self._fingerprint()
+        self._load_context_cache()
+
+    def _fingerprint(self) -> str:
+        """Hash of the policy text and every setting that changes what retrieval returns."""
+        h = hashlib.sha256()
+        for part in (
+            self.policy_text,
+            str(getattr(self.config, "rag_embedding_model", "")),
+            str(getattr(self.config, "rag_chunk_size", "")),
+            str(getattr(self.config, "rag_chunk_overlap", "")),
+            str(getattr(self.config, "rag_top_k", "")),
+        ):
+            data = part.encode("utf-8")
+            h.update(len(data).to_bytes(8, "little"))
+            h.update(data)
+        return h.hexdigest()
+
+    def _load_context_cache(self) -> None:
+        if not self._cache_path or not os.path.exists(self._cache_path):
+            return
+        try:
+            with open(self._cache_path, "rb") as f:
+                entry = json_loads(f.read())
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable RAG context cache: {e}")
+            return
+        if not isinstance(entry, dict) or entry.get("policy_hash") != self._policy_hash:
+            return  # policy or retrieval settings changed: stale entries are dropped on the next save
+        contexts = entry.get("contexts")
+        if isinstance(contexts, dict):
+            self._category_context.update({k: v for k, v in contexts.items() if isinstance(v, str)})
+            print(f"✅ Loaded cached RAG context for {len(self._category_context)} categor(ies)")
+
+    def _save_context_cache(self) -> None:
+        if not self._cache_path:
+            return
+        entry = {"policy_hash": self._policy_hash, "contexts": self._category_context}
+        try:
+            FileUtils.write_bytes_atomic(self._cache_path, json_dumps_bytes(entry))
+        except Exception as e:
+            print(f"⚠️ Could not write RAG context cache: {e}")
 
     def _init_rag(self):
         """Initialize RAG components lazily"""
@@ -35,11 +86,30 @@ class RAGPolicyExtractor:
             )
             chunks = text_splitter.split_text(self.policy_text)
 
-            # Create embeddings and vector store
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name=self.config.rag_embedding_model
+            # Create embeddings and vector store: encode all chunks in one batched
+            # pass and hand the vectors to FAISS so nothing is re-embedded there.
+            batch_size = getattr(self.config, "rag_embedding_batch_size", 64)
+
+            class _BatchedHuggingFaceEmbeddings(HuggingFaceEmbeddings):
+                def embed_documents(self, texts):
+                    vecs = self.client.encode(
+                        list(texts),
+                        batch_size=batch_size,
+                        convert_to_numpy=True,
+                        normalize_embeddings=True,
+                        show_progress_bar=False,
+                    )
+                    return vecs.tolist()
+
+            self.embeddings = _BatchedHuggingFaceEmbeddings(
+                model_name=self.config.rag_embedding_model,
+                encode_kwargs={"normalize_embeddings": True},
+            )
+            vecs = self.embeddings.embed_documents(chunks)
+            self.vector_store = FAISS.from_embeddings(
+                text_embeddings=list(zip(chunks, vecs)),
+                embedding=self.embeddings,
             )
-            self.vector_store = FAISS.from_texts(chunks, self.embeddings)
 
             print(f"✅ RAG initialized with {len(chunks)} policy chunks")
             return True
@@ -55,14 +125,32 @@ class RAGPolicyExtractor:
     def query_policy(self, query: str) -> str:
         """Query policy using RAG retrieval"""
         if self.vector_store is None:
-            if not self._init_rag():
+            # Do not retry a failed initialization (missing deps/model) for every query
+            if self._rag_unavailable or not self._init_rag():
+                self._rag_unavailable = True
                 return ""
 
         docs = self.vector_store.similarity_search(query, k=self.config.rag_top_k)
         return "\n\n".join([doc.page_content for doc in docs])
 
     def get_relevant_policy_for_category(self, category: str) -> str:
-        """Get policy sections relevant to a specific expense category"""
+        """Get policy sections relevant to a specific expense category (retrieved once per category)."""
+        cached = self._category_context.get(category)
+        if cached is not None:
+            return cached
+        context = self._retrieve_for_category(category)
+        if self.vector_store is not None:
+            self._category_context[category] = context
+            self._save_context_cache()
+        return context
+
+    def precompute_categories(self, categories) -> None:
+        """Build the index and retrieve context for each category up front (one embedding pass, one query each)."""
+        for category in categories:
+            self.get_relevant_policy_for_category(category)
+
+    def _retrieve_for_category(self, category: str) -> str:
+        """Run the category's retrieval query against the vector store."""
         queries = {
             "commute": "cab taxi commute transportation travel allowance limit policy",
             "cab": "cab taxi commute transportation travel allowance limit policy",
@@ -109,6 +197,11 @@ class PolicyExtractorWithRAG:
 
         return self.policy
 
+    def precompute_categories(self, categories) -> None:
+        """Warm the RAG index and per-category context once so decision runs only do dict lookups."""
+        if self.rag_extractor and self.config.enable_rag:
+            self.rag_extractor.precompute_categories(categories)
+
     def get_relevant_policy(self, category: str) -> Optional[str]:
         """Get relevant policy section using RAG (if enabled)"""
         if self.rag_extractor and self.config.enable_rag:
@@ -6,6 +6,8 @@ import re
 import uuid
 from typing import Any
 
+from rapidfuzz import fuzz
+
 MONTH_MAP = {
     "jan": 1, "feb": 2, "mar": 3, "apr": 4,
     "may": 5, "jun": 6, "jul": 7, "aug": 8,
@@ -209,6 +211,28 @@ def apply_amount_cap(bill: dict, amount: float | None, limit: float | None) -> N
         bill["reimbursable_amount"] = amount
 
 
+def name_match(receipt_name: str | None, emp_name: str | None, params: dict) -> tuple[float, bool]:
+    """Fuzzy-score receipt name vs employee name; return (score, passed) honouring name_match_required."""
+    score = fuzz.partial_ratio((receipt_name or "").lower(), (emp_name or "").lower())
+    if not params.get("name_match_required", True):
+        return score, True
+    return score, score >= params["name_match_threshold"]
+
+
+def _month_of(date_val: str, date_format: str) -> int:
+    """Month number of date_val. Fast split path for the default DD/MM/YYYY; strptime for other formats."""
+    if date_format == "%d/%m/%Y":
+        day, sep, rest = date_val.partition("/")
+        month, sep2, year = rest.partition("/")
+        if sep and sep2 and day.isdigit() and month.isdigit() and year.isdigit() and len(year) == 4:
+            m = int(month)
+            if 1 <= m <= 12 and 1 <= int(day) <= 31:
+                return m
+        raise ValueError(f"date {date_val!r} does not match format {date_format!r}")
+    from datetime import datetime
+    return datetime.strptime(date_val, date_format).month
+
+
 def month_match(bill: dict, params: dict, date_key: str = "date") -> bool:
     """Return True if month check is disabled (month_match_required: false) or bill date month matches emp_month."""
     if not params.get("month_match_required", True):
@@ -217,8 +241,7 @@ def month_match(bill: dict, params: dict, date_key: str = "date") -> bool:
         date_val = bill.get(date_key)
         if not date_val:
             return False
-        from datetime import datetime
-        month = datetime.strptime(date_val, params["date_format"]).month
+        month = _month_of(date_val, params["date_format"])
         expected = MONTH_MAP.get((bill.get("emp_month") or "").lower())
         return month == expected
     except Exception:
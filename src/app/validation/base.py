@@ -10,5 +10,7 @@ class BillValidator(Protocol):
         """
         Return a validation dict (e.g. month_match, name_match, is_valid).
         context can hold client_addresses, config, etc.
+        Validators may also provide validate_many(bills, context) -> list of validation dicts
+        to score a whole folder at once; extractors use it when present.
         """
         ...
@@ -1,13 +1,12 @@
 """Fuel bill validator: month match, name match, per-bill amount cap."""
 
-from rapidfuzz import fuzz
-
 from app.validation._common import (
     apply_amount_cap,
     correct_rupee_misread,
     ensure_bill_id,
     get_validation_params,
     month_match,
+    name_match,
     parse_amount,
 )
 
@@ -22,16 +21,11 @@ class FuelValidator:
         ensure_bill_id(fuel_bill, params["manual_id_prefix"])
         validations["month_match"] = month_match(fuel_bill, params, date_key="date")
 
-        receipt_name = (
-            fuel_bill.get("employee_name") or fuel_bill.get("buyer_name") or ""
-        ).lower()
-        emp = (fuel_bill.get("emp_name") or "").lower()
-        name_score = fuzz.partial_ratio(receipt_name, emp)
+        name_score, name_ok = name_match(
+            fuel_bill.get("employee_name") or fuel_bill.get("buyer_name"), fuel_bill.get("emp_name"), params
+        )
         validations["name_match_score"] = name_score
-        if params.get("name_match_required", True):
-            validations["name_match"] = name_score >= params["name_match_threshold"]
-        else:
-            validations["name_match"] = True
+        validations["name_match"] = name_ok
 
         amount = parse_amount(fuel_bill.get("amount"))
         ocr_text = fuel_bill.get("ocr")
@@ -1,13 +1,12 @@
 """Meal bill validator: month match, name match, per-bill amount cap."""
 
-from rapidfuzz import fuzz
-
 from app.validation._common import (
     apply_amount_cap,
     correct_rupee_misread,
     ensure_bill_id,
     get_validation_params,
     month_match,
+    name_match,
     parse_amount,
 )
 
@@ -22,14 +21,9 @@ class MealValidator:
         ensure_bill_id(meal_invoice, params["manual_id_prefix"])
         validations["month_match"] = month_match(meal_invoice, params)
 
-        rider = (meal_invoice.get("buyer_name") or "").lower()
-        emp = (meal_invoice.get("emp_name") or "").lower()
-        name_score = fuzz.partial_ratio(rider, emp)
+        name_score, name_ok = name_match(meal_invoice.get("buyer_name"), meal_invoice.get("emp_name"), params)
         validations["name_match_score"] = name_score
-        if params.get("name_match_required", True):
-            validations["name_match"] = name_score >= params["name_match_threshold"]
-        else:
-            validations["name_match"] = True
+        validations["name_match"] = name_ok
 
         amount = parse_amount(meal_invoice.get("amount"))
         ocr_text = meal_invoice.get("ocr")
@@ -1,49 +1,45 @@
 """Ride/commute bill validator: month, name, address match."""
 
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
 
 from app.validation._common import (
     ensure_bill_id,
     get_validation_params,
     month_match,
+    name_match,
 )
 
 
 class RideValidator:
-    """Validates commute/cab bills: month, name match, address match."""
+    """
+    Validates commute/cab bills: month, name match, address match.
+    context["client_addresses"] maps client (upper-case) to lower-cased addresses.
+    """
 
     def validate(self, ride: dict, context: dict | None = None) -> dict:
+        return self.validate_many([ride], context)[0]
+
+    def validate_many(self, rides: list[dict], context: dict | None = None) -> list[dict]:
+        """Validate several rides; address scoring is one cdist call per client for all of them."""
         context = context or {}
-        client_addresses = context.get("client_addresses", {})
         params = get_validation_params(
             context, "cab", include_address_threshold=True
         )
+        address_scores = _best_address_scores(rides, context.get("client_addresses", {}))
+        return [self._validate_one(ride, params, score) for ride, score in zip(rides, address_scores)]
+
+    @staticmethod
+    def _validate_one(ride: dict, params: dict, best_address_score: float) -> dict:
         validations = {}
 
         ensure_bill_id(ride, params["manual_id_prefix"])
         validations["month_match"] = month_match(ride, params)
 
-        rider = (ride.get("rider_name") or "").lower()
-        emp = (ride.get("emp_name") or "").lower()
-        name_score = fuzz.partial_ratio(rider, emp)
+        name_score, name_ok = name_match(ride.get("rider_name"), ride.get("emp_name"), params)
         validations["name_match_score"] = name_score
-        if params.get("name_match_required", True):
-            validations["name_match"] = name_score >= params["name_match_threshold"]
-        else:
-            validations["name_match"] = True
-
-        pickup = (ride.get("pickup_address") or "").lower()
-        drop = (ride.get("drop_address") or "").lower()
-        client = (ride.get("client") or "").upper()
-        addresses = client_addresses.get(client, [])
-        best_address_score = 0
-        for addr in addresses:
-            addr_lower = addr.lower()
-            best_address_score = max(
-                best_address_score,
-                fuzz.partial_ratio(pickup, addr_lower),
-                fuzz.partial_ratio(drop, addr_lower),
-            )
+        validations["name_match"] = name_ok
+
         validations["address_match_score"] = best_address_score
         if params.get("address_match_required", True):
             validations["address_match"] = (
@@ -58,3 +54,28 @@ class RideValidator:
             and validations["address_match"]
         )
         return validations
+
+
+def _best_address_scores(rides: list[dict], client_addresses: dict) -> list[float]:
+    """
+    Best partial_ratio of each ride's pickup/drop against its client's addresses (0 when the client is unknown).
+    Rides are grouped by client so each client needs a single C-level cdist over all pickups and drops.
+    """
+    best = [0.0] * len(rides)
+    by_client: dict[str, list[int]] = {}
+    for i, ride in enumerate(rides):
+        by_client.setdefault((ride.get("client") or "").upper(), []).append(i)
+    for client, indices in by_client.items():
+        addresses = client_addresses.get(client)
+        if not addresses:
+            continue
+        queries = []
+        for i in indices:
+            queries.append((rides[i].get("pickup_address") or "").lower())
+            queries.append((rides[i].get("drop_address") or "").lower())
+        scores = process.cdist(queries, addresses, scorer=fuzz.partial_ratio, dtype=np.float64, workers=-1)
+        # Row 2k is ride k's pickup, row 2k+1 its drop
+        per_ride = scores.max(axis=1).reshape(-1, 2).max(axis=1)
+        for i, score in zip(indices, per_ride):
+            best[i] = float(score)
+    return best
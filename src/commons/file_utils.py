@@ -7,6 +7,8 @@ To extend: use custom FileReader/FileWriter, TextExtractor, or FolderNameParser
 
 import json
 import os
+import threading
+from functools import lru_cache
 
 from commons.config import load_config
 from commons.io.local import LocalFileReader, LocalFileWriter
@@ -23,6 +25,11 @@ _default_parser = StandardFolderNameParser()
 _default_processor = LocalFolderProcessor(text_extractor=_default_extractor)
 
 
+@lru_cache(maxsize=32)
+def _load_text_file_cached(file_path: str, mtime_ns: int) -> str | None:
+    return FileUtils.load_text_file(file_path)
+
+
 class FileUtils:
     """Facade for file, OCR, and folder operations."""
 
@@ -49,6 +56,59 @@ class FileUtils:
         _default_writer.write_json(data, file_path)
         print(f"data written to {file_path}")
 
+    @staticmethod
+    def write_bytes_atomic(file_path: str, data: bytes) -> None:
+        """
+        Write data to a temp file, then rename it over file_path, so readers never see a partial file.
+        On error the temp file is removed and the exception re-raised.
+        """
+        _default_writer.ensure_dir(file_path)
+        # pid + thread id: worker threads share a pid and may write the same path at once
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def write_bills_parquet(bills: list[dict], file_path: str) -> bool:
+        """
+        Write bills as a zstd Parquet file (optional fast-reload copy; needs pyarrow).
+        Returns False when skipped (pyarrow missing, or bills that don't read back identically, e.g. rows
+        with different keys or empty dicts, which Parquet's fixed schema fills with None); any stale file is removed.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            return False
+        try:
+            table = pa.Table.from_pylist(bills)
+            # Readers prefer this copy over the JSON, so it must load back exactly as written
+            if table.to_pylist() != bills:
+                raise ValueError("bills do not round-trip through Parquet")
+            _default_writer.ensure_dir(file_path)
+            pq.write_table(table, file_path, compression="zstd")
+            return True
+        except Exception as e:
+            print(f"⚠️ Parquet copy skipped for {file_path}: {e}")
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            return False
+
+    @staticmethod
+    def read_bills_parquet(file_path: str) -> list[dict]:
+        """Read bills written by write_bills_parquet (raises ImportError if pyarrow is not installed)."""
+        import pyarrow.parquet as pq
+
+        return pq.read_table(file_path).to_pylist()
+
     @staticmethod
     def load_text_file(file_path: str) -> str | None:
         """Load text file. Uses default LocalFileReader."""
@@ -64,6 +124,20 @@ class FileUtils:
             print(f"An error occurred: {e}")
             return None
 
+    @staticmethod
+    def load_text_file_cached(file_path: str) -> str | None:
+        """load_text_file, read again only when the file's mtime changes (prompts and other static text)."""
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except OSError:
+            # Missing/unreadable: report it via load_text_file, but don't pin a None result in the cache
+            return FileUtils.load_text_file(file_path)
+        return _load_text_file_cached(file_path, mtime_ns)
+
+    @staticmethod
+    def clear_text_file_cache() -> None:
+        _load_text_file_cached.cache_clear()
+
     @staticmethod
     def load_json_from_file(file_path: str):
         """Load JSON file. Uses default LocalFileReader."""
@@ -4,6 +4,8 @@ import json
 import os
 from typing import Any
 
+from commons.utils import json_dumps_bytes, json_loads
+
 
 class LocalFileReader:
     """Read from local filesystem."""
@@ -20,8 +22,8 @@ class LocalFileReader:
     def read_json(self, path: str) -> Any:
         if not os.path.exists(path):
             raise FileNotFoundError(f"JSON file not found: {path}")
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return json_loads(f.read())
 
 
 class LocalFileWriter:
@@ -31,8 +33,8 @@ class LocalFileWriter:
         if isinstance(data, str):
             data = json.loads(data)
         self.ensure_dir(path)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(path, "wb") as f:
+            f.write(json_dumps_bytes(data, indent=True))
 
     def ensure_dir(self, path: str) -> None:
         dirpath = os.path.dirname(path)
@@ -1,5 +1,13 @@
 """LLM provider factory. Switch provider in config (llm.provider: groq | openai)."""
 
-from commons.llm.factory import get_llm, get_llm_model_name, get_llm_provider
+from commons.llm.factory import cacheable_system_message, get_llm, get_llm_model_name, get_llm_provider
+from commons.llm.loop import llm_event_loop, run_on_llm_loop
 
-__all__ = ["get_llm", "get_llm_model_name", "get_llm_provider"]
+__all__ = [
+    "cacheable_system_message",
+    "get_llm",
+    "get_llm_model_name",
+    "get_llm_provider",
+    "llm_event_loop",
+    "run_on_llm_loop",
+]
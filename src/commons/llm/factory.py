@@ -4,6 +4,7 @@ Add new providers by adding a _build_<name> function and registering in _BUILDER
 """
 
 import os
+from functools import lru_cache
 from typing import Any
 
 from commons.config import config
@@ -16,8 +17,9 @@ def get_llm_provider() -> str:
     return (llm_cfg.get(Co.PROVIDER) or "groq").strip().lower()
 
 
+@lru_cache(maxsize=1)
 def get_llm_model_name() -> str:
-    """Return the configured model name (for output paths, etc.)."""
+    """Return the configured model name (for output paths, etc.). Config is static per process, so cached."""
     llm_cfg = config.get(Co.LLM) or {}
     provider = get_llm_provider()
     providers_cfg = llm_cfg.get(Co.PROVIDERS) or {}
@@ -30,6 +32,39 @@ def get_llm_model_name() -> str:
     )
 
 
+def cacheable_system_message(*parts: str) -> Any:
+    """
+    One SystemMessage for a static prompt prefix (parts joined by blank lines). Groq/OpenAI cache shared
+    prefixes automatically; Anthropic needs an explicit cache_control marker (set on the last block).
+    """
+    from langchain_core.messages import SystemMessage
+
+    if get_llm_provider() == "anthropic":
+        blocks = [{"type": "text", "text": part} for part in parts]
+        blocks[-1]["cache_control"] = {"type": "ephemeral"}
+        return SystemMessage(content=blocks)
+    return SystemMessage(content="\n\n".join(parts))
+
+
+@lru_cache(maxsize=1)
+def _enable_response_cache() -> None:
+    """
+    Optional exact-match response cache for every chat model (llm.cache_path, SQLite via langchain-community).
+    Identical prompts (same model/params) are answered from disk instead of the provider.
+    """
+    cache_path = (config.get(Co.LLM) or {}).get("cache_path")
+    if not cache_path:
+        return
+    try:
+        from langchain_community.cache import SQLiteCache
+        from langchain_core.globals import set_llm_cache
+    except ImportError:
+        print("⚠️ llm.cache_path is set but langchain-community is not installed; LLM response cache disabled")
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    set_llm_cache(SQLiteCache(database_path=cache_path))
+
+
 def get_llm(
     model: str | None = None,
     temperature: float | None = None,
@@ -40,6 +75,7 @@ def get_llm(
     Uses llm.provider and llm.providers.<provider>. Override model/temperature via args.
     Set env vars for cloud providers (e.g. GROQ_API_KEY). Local (ollama) needs no key.
     """
+    _enable_response_cache()
     llm_cfg = config.get(Co.LLM) or {}
     provider = (llm_cfg.get(Co.PROVIDER) or "groq").strip().lower()
     providers_cfg = llm_cfg.get(Co.PROVIDERS) or {}
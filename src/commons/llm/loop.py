@@ -0,0 +1,40 @@
+"""
+One long-lived event loop for async LLM calls.
+Provider clients (e.g. ChatOpenAI's shared httpx.AsyncClient) keep pooled connections bound to the loop that
+opened them, so every async call in the process runs here instead of in a fresh asyncio.run() per call site.
+"""
+
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def llm_event_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide LLM loop, started on first use in a daemon thread."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-event-loop", daemon=True).start()
+        return _loop
+
+
+def run_on_llm_loop(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run coro on the LLM loop and block until it finishes (safe from any thread, including several at once).
+    Code already running on the LLM loop must await the coroutine instead.
+    """
+    loop = llm_event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_on_llm_loop() called from the LLM event loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
@@ -7,6 +7,11 @@ import numpy as np
 import pytesseract
 
 
+# Two passes on purpose: replacing "2 " first changes what "7 " can match (e.g. "7 2 500")
+_RUPEE_AS_2_RE = re.compile(r"\b2\s+(?=[\d,])")
+_RUPEE_AS_7_RE = re.compile(r"\b7\s+(?=[\d,])")
+
+
 def normalize_ocr_rupee_symbol(text: str) -> str:
     """Replace OCR misreads of rupee (₹) as lone 2 or 7 before amount with 'Rs. '.
     E.g. '2 500' or '7 1,200' -> 'Rs. 500' / 'Rs. 1,200' so downstream parsing sees a clear amount.
@@ -14,51 +19,68 @@ def normalize_ocr_rupee_symbol(text: str) -> str:
     if not text or not isinstance(text, str):
         return text
     # Lone 2 or 7 (word boundary) followed by space and then digits -> treat as rupee, replace with Rs. 
-    text = re.sub(r"\b2\s+(?=[\d,])", "Rs. ", text)
-    text = re.sub(r"\b7\s+(?=[\d,])", "Rs. ", text)
+    text = _RUPEE_AS_2_RE.sub("Rs. ", text)
+    text = _RUPEE_AS_7_RE.sub("Rs. ", text)
     return text
 
 
-def _tesseract_config() -> tuple[int, str]:
+def _tesseract_config() -> dict:
     try:
         from commons.config import config
         ocr = config.get("ocr") or {}
-        t = ocr.get("tesseract") or {}
-        return t.get("dpi", 300), t.get("lang", "eng")
+        return ocr.get("tesseract") or {}
     except Exception:
-        return 300, "eng"
+        return {}
 
 
 class TesseractPdfExtractor:
-    """Extract text from PDF/images; uses native text first, then OCR. Params default from config.yaml ocr.tesseract."""
-
-    def __init__(self, dpi: int | None = None, ocr_lang: str | None = None):
-        cfg_dpi, cfg_lang = _tesseract_config()
-        self.dpi = dpi if dpi is not None else cfg_dpi
-        self.ocr_lang = ocr_lang if ocr_lang is not None else cfg_lang
+    """
+    Extract text from PDF/images; uses native (PyMuPDF) text first, then OCR for pages with too little text.
+    Params default from config.yaml ocr.tesseract.
+    """
 
-    def extract(self, file_name: str, file_path: str) -> dict[str, str]:
-        doc = fitz.open(file_path)
-        full_text = ""
+    def __init__(
+        self,
+        dpi: int | None = None,
+        ocr_lang: str | None = None,
+        psm: int | None = None,
+        max_width: int | None = None,
+        min_native_chars: int | None = None,
+    ):
+        cfg = _tesseract_config()
+        self.dpi = dpi if dpi is not None else cfg.get("dpi", 300)
+        self.ocr_lang = ocr_lang if ocr_lang is not None else cfg.get("lang", "eng")
+        self.psm = psm if psm is not None else cfg.get("psm", 11)
+        self.max_width = max_width if max_width is not None else cfg.get("max_width", 2000)
+        self.min_native_chars = min_native_chars if min_native_chars is not None else cfg.get("min_native_chars", 20)
 
-        for page in doc:
-            native_text = page.get_text("text")
-            if native_text.strip():
-                full_text += native_text + "\n"
-                continue
+    def _ocr_page(self, page) -> str:
+        """Render page to grayscale (capped at max_width px), denoise, binarize and OCR."""
+        dpi = self.dpi
+        width_in = page.rect.width / 72
+        if self.max_width and width_in * dpi > self.max_width:
+            dpi = max(72, int(self.max_width / width_in))
+        pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+        gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)[:, :, 0]
+        gray = cv2.bilateralFilter(gray, d=5, sigmaColor=75, sigmaSpace=2)
+        gray = cv2.adaptiveThreshold(
+            gray, 255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY,
+            31, 2,
+        )
+        return pytesseract.image_to_string(gray, lang=self.ocr_lang, config=f"--psm {self.psm}")
 
-            pix = page.get_pixmap(dpi=self.dpi)
-            img = np.frombuffer(pix.tobytes(), dtype=np.uint8)
-            img = cv2.imdecode(img, cv2.IMREAD_COLOR)
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            gray = cv2.adaptiveThreshold(
-                gray, 255,
-                cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                cv2.THRESH_BINARY,
-                31, 2,
-            )
-            text_ocr = pytesseract.image_to_string(gray, lang=self.ocr_lang)
-            full_text += text_ocr + "\n"
+    def extract(self, file_name: str, file_path: str) -> dict[str, str]:
+        parts = []
+        with fitz.open(file_path) as doc:
+            for page in doc:
+                native_text = page.get_text("text")
+                if len(native_text.strip()) >= self.min_native_chars:
+                    parts.append(native_text)
+                else:
+                    parts.append(self._ocr_page(page))
 
+        full_text = "".join(p + "\n" for p in parts)
         full_text = normalize_ocr_rupee_symbol(full_text)
         return {file_name: full_text}
@@ -2,16 +2,61 @@
 
 from __future__ import annotations
 
+import json
 import os
+import re
 import shutil
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:  # Optional speedup: orjson parses/serializes several times faster than stdlib json
+    import orjson
+except ImportError:  # pragma: no cover - exercised only when orjson is not installed
+    orjson = None
 
 # Date formats used for parsing bill dates (DD/MM/YYYY) and emitting month (YYYY-MM)
 DATE_FMT = "%d/%m/%Y"
 MONTH_FMT = "%Y-%m"
 
 
+# -----------------------------------------------------------------------------
+# JSON (orjson when installed, stdlib json otherwise)
+# -----------------------------------------------------------------------------
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize numpy scalars (e.g. rapidfuzz scores) the way stdlib json does."""
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_bytes(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (non-ASCII kept as-is); indent=True uses 2 spaces, sort_keys=True is canonical."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_orjson_default, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+
+
+def json_dumps(obj: Any) -> str:
+    """Compact JSON text (no whitespace, non-ASCII kept as-is), e.g. for LLM prompts."""
+    return json_dumps_bytes(obj).decode("utf-8")
+
+
 # -----------------------------------------------------------------------------
 # Bill data: amounts, dates, currency
 # -----------------------------------------------------------------------------
@@ -25,7 +70,7 @@ def bill_amount(bill: Dict) -> float:
         return 0.0
 
 
-def currency_from_bills(bills: List[Dict]) -> Optional[str]:
+def currency_from_bills(bills: Iterable[Dict]) -> Optional[str]:
     """First non-empty currency from bills; None if none found."""
     for b in bills or []:
         c = (b.get("currency") or "").strip()
@@ -34,8 +79,17 @@ def currency_from_bills(bills: List[Dict]) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=4096)
+def _parse_month(date_str: str, date_fmt: str, month_fmt: str) -> Optional[str]:
+    """strptime is slow and bills share few distinct dates, so each date string is parsed once per process."""
+    try:
+        return datetime.strptime(date_str, date_fmt).strftime(month_fmt)
+    except ValueError:
+        return None
+
+
 def month_from_bills(
-    bills: List[Dict],
+    bills: Iterable[Dict],
     date_key: str = "date",
     date_fmt: str = DATE_FMT,
     month_fmt: str = MONTH_FMT,
@@ -45,11 +99,9 @@ def month_from_bills(
         date_val = b.get(date_key)
         if not date_val:
             continue
-        try:
-            dt = datetime.strptime(str(date_val).strip(), date_fmt)
-            return dt.strftime(month_fmt)
-        except (ValueError, TypeError):
-            continue
+        month = _parse_month(str(date_val).strip(), date_fmt, month_fmt)
+        if month:
+            return month
     return "unknown"
 
 
@@ -61,14 +113,11 @@ def month_from_date_str(
     """Parse date string (DD/MM/YYYY) to YYYY-MM; None if invalid."""
     if not date_str:
         return None
-    try:
-        return datetime.strptime(str(date_str).strip(), date_fmt).strftime(month_fmt)
-    except (ValueError, TypeError):
-        return None
+    return _parse_month(str(date_str).strip(), date_fmt, month_fmt)
 
 
 def daily_totals_from_bills(bills: List[Dict], date_key: str = "date") -> Dict[str, float]:
-    """Sum of bill amounts by date (date_str -> total)."""
+    """Sum of bill amounts by date (date_str -> total). Public helper; preprocessing now sums in its own bucket pass."""
     totals: Dict[str, float] = {}
     for b in bills:
         date_val = b.get(date_key)
@@ -87,7 +136,10 @@ def normalize_category_for_path(category: str) -> str:
 
 
 def find_employee_resources_dir(category_resources_path: str, emp_id: str) -> Optional[str]:
-    """First folder under category_resources_path whose name starts with emp_id; None if not found."""
+    """
+    First folder under category_resources_path whose name starts with emp_id; None if not found.
+    Public helper; copy_files uses a per-category index that prefers an exact {emp_id}_ folder instead.
+    """
     if not os.path.exists(category_resources_path):
         return None
     for name in os.listdir(category_resources_path):
@@ -100,18 +152,73 @@ def find_employee_resources_dir(category_resources_path: str, emp_id: str) -> Op
 # File copy
 # -----------------------------------------------------------------------------
 
+_COPY_CHUNK = 1024 * 1024
+
+
+def fast_copy(src: str, dst: str) -> None:
+    """
+    Copy file contents and permission bits (like shutil.copy). Uses os.copy_file_range where available
+    (in-kernel copy; a metadata-only clone on CoW filesystems), else a 1 MB buffered copy.
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        copied = False
+        if hasattr(os, "copy_file_range"):
+            try:
+                total = 0
+                while n := os.copy_file_range(fsrc.fileno(), fdst.fileno(), _COPY_CHUNK * 64):
+                    total += n
+                # 0 bytes: empty source, or a filesystem (overlay/FUSE/procfs-style) that doesn't support it.
+                # The buffered copy settles both (and costs nothing for an empty file)
+                copied = total > 0
+            except OSError:
+                # ENOSYS/EXDEV/EINVAL etc.: restart with a plain copy
+                pass
+            if not copied:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        if not copied:
+            shutil.copyfileobj(fsrc, fdst, _COPY_CHUNK)
+    shutil.copymode(src, dst)
+
+
+def files_matching(src_dir: str, filename_substrings: List[str]) -> List[Tuple[str, str]]:
+    """(path, name) of files in src_dir whose name contains any of filename_substrings."""
+    return files_matching_each(src_dir, filename_substrings)[0]
+
+
+def files_matching_each(src_dir: str, *filename_substring_lists: List[str]) -> List[List[Tuple[str, str]]]:
+    """files_matching for several substring lists (e.g. valid and invalid bills) with a single directory scan."""
+    # Bill filenames are usually the exact file name: set hit first; otherwise one regex alternation
+    # searches all substrings in a single C-level pass (instead of a Python loop per candidate)
+    matchers = []
+    for substrings in filename_substring_lists:
+        wanted = {s for s in substrings or () if s}
+        matchers.append((wanted, re.compile("|".join(map(re.escape, wanted))) if wanted else None))
+    results: List[List[Tuple[str, str]]] = [[] for _ in matchers]
+    if not any(wanted for wanted, _ in matchers):
+        return results
+    with os.scandir(src_dir) as it:
+        for entry in it:
+            name = entry.name
+            hits = [
+                i for i, (wanted, pattern) in enumerate(matchers)
+                if wanted and (name in wanted or pattern.search(name))
+            ]
+            if hits and entry.is_file():
+                for i in hits:
+                    results[i].append((entry.path, name))
+    return results
+
+
 def copy_files_matching(
     src_dir: str, dest_dir: str, filename_substrings: List[str]
 ) -> int:
-    """Copy files from src_dir to dest_dir where any of filename_substrings appears in the file name. Returns count."""
-    if not filename_substrings:
-        return 0
-    count = 0
-    for fname in os.listdir(src_dir):
-        if not any(s for s in filename_substrings if s and s in fname):
-            continue
-        src_path = os.path.join(src_dir, fname)
-        if os.path.isfile(src_path):
-            shutil.copy(src_path, os.path.join(dest_dir, fname))
-            count += 1
-    return count
+    """
+    Copy files from src_dir to dest_dir where any of filename_substrings appears in the file name. Returns count.
+    Public helper; copy_files builds one manifest for all employees and copies it on a thread pool instead.
+    """
+    matches = files_matching(src_dir, filename_substrings)
+    for src_path, name in matches:
+        fast_copy(src_path, os.path.join(dest_dir, name))
+    return len(matches)
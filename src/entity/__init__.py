@@ -1,5 +1,6 @@
 """Shared entities: employee, decision group, extraction schemas."""
 
+from entity.decision_schema import DecisionItem, EnrichedDecision
 from entity.employee import DecisionGroup, Employee
 
-__all__ = ["DecisionGroup", "Employee"]
+__all__ = ["DecisionGroup", "DecisionItem", "Employee", "EnrichedDecision"]
@@ -0,0 +1,56 @@
+from typing import Any, Optional, TypedDict
+
+from pydantic import BaseModel, ConfigDict
+
+
+class BillReason(BaseModel):
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+
+    bill_id: Optional[str] = None
+    reason: Optional[str] = None
+
+
+class DecisionItem(BaseModel):
+    """
+    One decision object as returned by the LLM, before enrichment. Only the fields enrichment reads are typed
+    (bill ids coerced to str); amounts, currency and any other keys pass through untouched.
+    """
+
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+
+    decision: Optional[str] = None  # "APPROVE" | "REJECT" (case normalized during enrichment)
+    employee_id: Optional[str] = None
+    employee_name: Optional[str] = None
+    category: Optional[str] = None
+    valid_bill_ids: Optional[list[str]] = None
+    invalid_bill_ids: Optional[list[str]] = None
+    invalid_bill_reasons: Optional[list[BillReason]] = None
+
+
+class EnrichedDecision(TypedDict, total=False):
+    """Shape of a decision after enrichment (what output files, the decision cache and postprocessing read)."""
+
+    decision: str  # "APPROVE" | "REJECT"
+    employee_id: str
+    employee_name: str
+    category: str
+    valid_bill_ids: list[str]
+    invalid_bill_ids: list[str]
+    invalid_bill_reasons: list[dict[str, Any]]  # [{"bill_id", "reason"}]
+    error_summary: list[dict[str, Any]]  # [{"reason", "bill_ids", "count"}]
+    reasons: list[str]
+    currency: str
+    claimed_amount: float
+    approved_amount: float
+    daily_total: Optional[float]
+    monthly_total: Optional[float]
+    daily_limit: float
+    reimbursable_daily_total: float
+    daily_total_exceeds_limit: bool
+    month: Optional[str]
+    date: Optional[str]
+    confidence_score: float
+    manual_review: bool
+    parse_failed: bool
+    decided_by: str  # "rules" when decided without the LLM
+    paired_by_position: bool  # True when a count mismatch left only list position to pair it (never cached)
@@ -23,7 +23,7 @@ class Employee:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DecisionGroup:
     """
     One decision group: employee + category, optionally scoped to a single date (meals).
@@ -3,6 +3,9 @@ from typing import Optional
 from pydantic import BaseModel, RootModel, field_validator
 
 
+_DISTANCE_RE = re.compile(r"([\d.]+)\s*(?:km|KM|kilometers?|mi|miles?)?", re.IGNORECASE)
+
+
 def _parse_distance(value: str | float | None) -> float | None:
     """Parse distance_km from string like '14.1 km' or 14.1 -> float or None."""
     if value is None:
@@ -13,7 +16,7 @@ def _parse_distance(value: str | float | None) -> float | None:
     if not s:
         return None
     # Strip unit (km, KM, miles, mi, etc.) and parse number
-    match = re.search(r"([\d.]+)\s*(?:km|KM|kilometers?|mi|miles?)?", s, re.IGNORECASE)
+    match = _DISTANCE_RE.search(s)
     if match:
         try:
             return float(match.group(1))
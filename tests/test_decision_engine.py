@@ -1,9 +1,19 @@
-"""Tests for app.decision.engine and preprocessing (unit tests; no LLM calls)."""
+"""Tests for app.decision.engine and preprocessing (unit tests; no real LLM calls)."""
+
+import asyncio
+from types import SimpleNamespace
 
 import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+from commons.llm import llm_event_loop, run_on_llm_loop
 
-from app.decision.engine import DecisionEngine
-from app.decision.preprocessing import prepare_groups
+from app.decision.cache import DecisionCache
+from app.decision.engine import DecisionEngine, _enrich_decision_item, _parse_and_enrich_decisions
+from app.decision.postprocessing import build_summary_from_grouped, copy_files, group_decisions
+from app.decision.preprocessing import add_rag_context, prepare_groups
+from app.rag.extractors import RAGPolicyExtractor
 
 
 def test_prepare_groups_meal_daily_totals():
@@ -78,3 +88,293 @@ def test_load_system_prompt_returns_string():
     )
     prompt = engine._load_system_prompt()
     assert isinstance(prompt, str)
+
+
+def test_decide_in_batches_keeps_group_order():
+    bills_map = {
+        "E1_Alice": [
+            {"id": f"b{i}", "filename": f"f{i}.pdf", "category": "meal", "date": f"{10 + i % 4}/01/2025",
+             "amount": 10, "validation": {"is_valid": True}}
+            for i in range(7)
+        ],
+    }
+    groups_data, _ = prepare_groups(bills_map)
+    engine = DecisionEngine(model_name="test-model", temperature=0, output_dir="out", resources_dir="res", batch_size=2)
+    engine.llm = FakeListChatModel(responses=['[{"decision": "approve"}, {"decision": "approve"}]'])
+    _, decisions = engine._decide(groups_data, {}, None)
+    assert [d["date"] for d in decisions] == [g.date for g in groups_data]
+    assert all(d["decision"] == "APPROVE" and not d["parse_failed"] for d in decisions)
+
+
+def test_decide_calls_share_one_event_loop():
+    bills_map = {"E1_Alice": [{"id": "b1", "filename": "f1.pdf", "category": "commute", "amount": 10, "validation": {"is_valid": True}}]}
+    groups_data, _ = prepare_groups(bills_map)
+    engine = DecisionEngine(model_name="test-model", temperature=0, output_dir="out", resources_dir="res", retry_missing=True)
+    loops = []
+
+    async def answer(messages):
+        loops.append(asyncio.get_running_loop())
+        return "not json" if len(loops) == 1 else '[{"decision": "approve"}]'
+
+    engine._chain = RunnableLambda(answer)
+    for _ in range(2):
+        _, decisions = engine._decide(groups_data, {}, None)
+    # First call fails and is retried; every call (retry included) must reuse the same open loop
+    assert len(loops) == 3 and len(set(loops)) == 1 and not loops[0].is_closed()
+    assert decisions[0]["decision"] == "APPROVE"
+
+
+def test_decide_reuses_cached_decisions(tmp_path):
+    bills_map = {"E1_Alice": [{"id": "b1", "filename": "f1.pdf", "category": "commute", "amount": 10, "validation": {"is_valid": True}}]}
+    groups_data, _ = prepare_groups(bills_map)
+    engine = DecisionEngine(
+        model_name="test-model", temperature=0, output_dir="out", resources_dir="res",
+        cache_path=str(tmp_path / "decisions.sqlite"),
+    )
+    engine.llm = FakeListChatModel(responses=['[{"decision": "approve"}]'])
+    _, first = engine._decide(groups_data, {"limit": 100}, None)
+    engine.llm = FakeListChatModel(responses=["not json"])
+    _, second = engine._decide(groups_data, {"limit": 100}, None)
+    assert second == first and second[0]["decision"] == "APPROVE"
+    _, changed_policy = engine._decide(groups_data, {"limit": 50}, None)
+    assert changed_policy[0]["parse_failed"] is True
+
+
+def test_decision_cache_key_uses_only_the_groups_org_entry():
+    bills_map = {"E1_Alice": [{"id": "b1", "filename": "f1.pdf", "category": "commute", "amount": 10, "validation": {"is_valid": True}}]}
+    groups_data, _ = prepare_groups(bills_map)
+    group = groups_data[0].to_dict()
+    org = {"E1_Alice": {"manager": "M1"}, "E2_Bob": {"manager": "M2"}}
+    base = DecisionCache.key("m", 0, "prompt", {"limit": 100}, org, group)
+    assert DecisionCache.key("m", 0, "prompt", {"limit": 100}, {**org, "E2_Bob": {"manager": "M9"}}, group) == base
+    assert DecisionCache.key("m", 0, "prompt", {"limit": 100}, {**org, "E1_Alice": {"manager": "M9"}}, group) != base
+    assert DecisionCache.key("m", 0.7, "prompt", {"limit": 100}, org, group) != base
+
+
+def test_streamed_decisions_match_full_parse():
+    bills_map = {
+        "E1_Alice": [
+            {"id": f"b{i}", "filename": f"f{i}.pdf", "category": "meal", "date": f"{10 + i}/01/2025",
+             "amount": 10, "validation": {"is_valid": True}}
+            for i in range(2)
+        ],
+    }
+    groups_data, _ = prepare_groups(bills_map)
+    reply = 'Here you go:\n[{"decision": "approve", "reason": "ok {fine} \\"x\\""}, {"decision": "reject", "meta": {"a": [1]}}]'
+    results = []
+    for stream in (False, True):
+        engine = DecisionEngine(model_name="test-model", temperature=0, output_dir="out", resources_dir="res", stream=stream)
+        engine.llm = FakeListChatModel(responses=[reply])
+        results.append(engine._decide(groups_data, {}, None)[1])
+    assert results[0] == results[1]
+    assert [d["decision"] for d in results[1]] == ["APPROVE", "REJECT"]
+    assert not any(d["parse_failed"] for d in results[1])
+
+
+def test_add_rag_context_looks_up_each_category_once():
+    bills_map = {
+        "E1_Alice": [
+            {"id": f"b{i}", "filename": f"f{i}.pdf", "category": "meal", "date": f"{10 + i}/01/2025",
+             "amount": 10, "validation": {"is_valid": True}}
+            for i in range(3)
+        ],
+    }
+    groups_data, _ = prepare_groups(bills_map)
+    calls = []
+
+    class _Extractor:
+        def get_relevant_policy(self, category):
+            calls.append(category)
+            return "meal policy"
+
+    add_rag_context(groups_data, _Extractor(), enable_rag=True)
+    assert calls == ["meal"]
+    assert all(g.rag_policy_context == "meal policy" for g in groups_data)
+
+
+def test_rag_context_persists_across_runs(tmp_path):
+    config = SimpleNamespace(rag_cache_path=str(tmp_path / "rag.json"), rag_top_k=2)
+
+    class _Store:
+        def similarity_search(self, query, k):
+            return [SimpleNamespace(page_content=f"chunk for {query}")]
+
+    first = RAGPolicyExtractor("policy v1", config)
+    first.vector_store = _Store()
+    context = first.get_relevant_policy_for_category("meal")
+    assert RAGPolicyExtractor("policy v1", config).get_relevant_policy_for_category("meal") == context
+    assert "meal" not in RAGPolicyExtractor("policy v2", config)._category_context
+
+
+def test_rule_fast_path_skips_llm_for_trivial_groups():
+    bills_map = {
+        "E1_Alice": [
+            {"id": "m1", "filename": "m1.pdf", "category": "meal", "date": "10/01/2025", "amount": 200,
+             "validation": {"is_valid": True}},
+            {"id": "c1", "filename": "c1.pdf", "category": "commute", "amount": 50, "validation": {"is_valid": False}},
+            {"id": "c2", "filename": "c2.pdf", "category": "fuel", "amount": 80, "validation": {"is_valid": True}},
+        ],
+    }
+    groups_data, _ = prepare_groups(bills_map)
+    for g in groups_data:
+        if g.category == "meal":
+            g.daily_limit, g.reimbursable_daily_total, g.daily_total_exceeds_limit = 125.0, 125.0, True
+    engine = DecisionEngine(model_name="test-model", temperature=0, output_dir="out", resources_dir="res", rule_fast_path=True)
+    engine.llm = FakeListChatModel(responses=['[{"decision": "approve"}]'])
+    _, decisions = engine._decide(groups_data, {}, None)
+    by_category = {d["category"]: d for d in decisions}
+    assert by_category["meal"]["decision"] == "APPROVE" and by_category["meal"]["approved_amount"] == 125.0
+    assert by_category["commute"]["decision"] == "REJECT" and by_category["commute"]["invalid_bill_ids"] == ["c1"]
+    assert by_category["fuel"].get("decided_by") is None and by_category["fuel"]["decision"] == "APPROVE"
+
+
+def test_partial_response_is_realigned_and_missing_group_retried():
+    bills_map = {
+        "E1_Alice": [{"id": "c1", "filename": "c1.pdf", "category": "commute", "amount": 10, "validation": {"is_valid": True}}],
+        "E2_Bob": [{"id": "f1", "filename": "f1.pdf", "category": "fuel", "amount": 20, "validation": {"is_valid": True}}],
+    }
+    groups_data, _ = prepare_groups(bills_map)
+    engine = DecisionEngine(
+        model_name="test-model", temperature=0, output_dir="out", resources_dir="res", retry_missing=True,
+    )
+    engine.llm = FakeListChatModel(responses=[
+        '[{"decision": "reject", "employee_id": "E2", "category": "fuel", "invalid_bill_ids": ["f1"]}]',
+        '[{"decision": "approve", "employee_id": "E1", "category": "commute", "valid_bill_ids": ["c1"]}]',
+    ])
+    _, decisions = engine._decide(groups_data, {}, None)
+    by_employee = {d["employee_id"]: d for d in decisions}
+    assert by_employee["E2"]["decision"] == "REJECT" and not by_employee["E2"]["parse_failed"]
+    assert by_employee["E1"]["decision"] == "APPROVE" and not by_employee["E1"]["parse_failed"]
+
+
+def test_enrich_uses_daily_totals_for_unnormalized_meal_category():
+    bills_map = {"E1_Alice": [{"id": "m1", "filename": "m1.pdf", "category": "meal", "date": "10/01/2025",
+                               "amount": 300, "validation": {"is_valid": True}}]}
+    groups_data, _ = prepare_groups(bills_map)
+    group = groups_data[0]
+    group.category = " Meal "
+    item = {"decision": "approve"}
+    _enrich_decision_item(item, group)
+    # Claimed amount and confidence both read the daily total (monthly_total is None for meal groups)
+    assert item["category"] == "meal" and item["claimed_amount"] == 300.0
+    assert item["confidence_score"] == 1.0 and item["manual_review"] is False
+
+
+def test_positionally_paired_decisions_are_not_cached(tmp_path):
+    bills_map = {
+        "E1_Alice": [{"id": "c1", "filename": "c1.pdf", "category": "commute", "amount": 10, "validation": {"is_valid": True}}],
+        "E2_Bob": [{"id": "f1", "filename": "f1.pdf", "category": "fuel", "amount": 20, "validation": {"is_valid": True}}],
+    }
+    groups_data, _ = prepare_groups(bills_map)
+    engine = DecisionEngine(
+        model_name="test-model", temperature=0, output_dir="out", resources_dir="res",
+        cache_path=str(tmp_path / "decisions.sqlite"),
+    )
+    # One anonymous item for two groups: nothing to realign on, so it is paired with the first group by position
+    engine.llm = FakeListChatModel(responses=['[{"decision": "approve"}]'])
+    _, first = engine._decide(groups_data, {}, None)
+    assert first[0]["paired_by_position"] is True and first[1]["parse_failed"] is True
+    engine.llm = FakeListChatModel(responses=["not json"])
+    _, second = engine._decide(groups_data, {}, None)
+    assert all(d["parse_failed"] for d in second)
+
+
+def test_arun_with_prepared_decides_categories_concurrently(tmp_path):
+    bills_map = {
+        "E1_Alice": [
+            {"id": "c1", "filename": "c1.pdf", "category": "commute", "amount": 10, "validation": {"is_valid": True}},
+            {"id": "f1", "filename": "f1.pdf", "category": "fuel", "amount": 20, "validation": {"is_valid": True}},
+        ],
+    }
+    groups_data, save_data = prepare_groups(bills_map)
+    engine = DecisionEngine(
+        model_name="test-model", temperature=0, output_dir=str(tmp_path), resources_dir=str(tmp_path / "res"),
+    )
+    loops = []
+
+    async def answer(messages):
+        loops.append(asyncio.get_running_loop())
+        return '[{"decision": "approve"}]'
+
+    engine._chain = RunnableLambda(answer)
+
+    async def decide_all():
+        return await asyncio.gather(*(
+            engine.arun_with_prepared(
+                [g for g in groups_data if g.category == category],
+                [s for s in save_data if s["category"] == category],
+                {},
+                category=category,
+            )
+            for category in ("commute", "fuel")
+        ))
+
+    commute, fuel = run_on_llm_loop(decide_all())
+    assert [d["category"] for d in commute + fuel] == ["commute", "fuel"]
+    assert all(d["decision"] == "APPROVE" for d in commute + fuel)
+    # Awaited on the caller's (shared LLM) loop: no per-category thread with its own asyncio.run()
+    assert loops == [llm_event_loop(), llm_event_loop()]
+
+
+def test_decision_items_are_validated_before_enrichment():
+    bills_map = {
+        "E1_Alice": [{"id": "7", "filename": "f.pdf", "category": "fuel", "amount": 20, "validation": {"is_valid": True}}],
+        "E2_Bob": [{"id": "9", "filename": "g.pdf", "category": "fuel", "amount": 20, "validation": {"is_valid": True}}],
+    }
+    groups_data, _ = prepare_groups(bills_map)
+    decisions = _parse_and_enrich_decisions(
+        '[{"decision": "reject", "invalid_bill_ids": [7], "invalid_bill_reasons": [{"bill_id": 7, "reason": "blurry"}]},'
+        ' {"decision": "approve", "valid_bill_ids": {"not": "a list"}}]',
+        groups_data,
+    )
+    assert decisions[0]["invalid_bill_ids"] == ["7"] and decisions[0]["invalid_bill_reasons"][0]["reason"] == "blurry"
+    assert decisions[1]["parse_failed"] is True
+
+
+def test_approve_without_invalid_bills_gets_empty_reasons_and_summary():
+    bills_map = {
+        "E1_Alice": [{"id": "7", "filename": "f.pdf", "category": "fuel", "amount": 20, "validation": {"is_valid": True}}],
+    }
+    groups_data, _ = prepare_groups(bills_map)
+    [decision] = _parse_and_enrich_decisions('[{"decision": "APPROVE", "valid_bill_ids": ["7"]}]', groups_data)
+    assert decision["invalid_bill_reasons"] == [] and decision["error_summary"] == []
+    assert decision["approved_amount"] == 20.0
+
+
+def test_unparseable_output_gives_enriched_parse_failed_placeholders():
+    bills_map = {
+        "E1_Alice": [{"id": "7", "filename": "f.pdf", "category": "fuel", "amount": 20, "validation": {"is_valid": True}}],
+    }
+    groups_data, _ = prepare_groups(bills_map)
+    [decision] = _parse_and_enrich_decisions("not json at all", groups_data)
+    assert decision["parse_failed"] is True and decision["decision"] == "REJECT"
+    assert decision["category"] == "fuel" and decision["approved_amount"] == 0
+    assert decision["invalid_bill_ids"] == ["7"] and decision["valid_bill_ids"] == []
+
+
+def test_copy_files_prefers_exact_emp_id_folder(tmp_path, monkeypatch):
+    resources = tmp_path / "res" / "fuel"
+    for folder in ("E12_Zed", "E1_Alice", "E1extra"):
+        (resources / folder).mkdir(parents=True)
+        (resources / folder / "bill.pdf").write_text(folder)
+    # List the longer id and the bare-prefix folder first: a plain startswith scan would pick one of them
+    listing = ["E12_Zed", "E1extra", "E1_Alice"]
+    monkeypatch.setattr("app.decision.postprocessing._list_dir", lambda path: listing)
+    save_data = [
+        {"employee_id": "E1", "employee_name": "Alice", "category": "fuel", "valid_files": ["bill.pdf"], "invalid_files": []},
+        {"employee_id": "E1e", "employee_name": "Eve", "category": "fuel", "valid_files": ["bill.pdf"], "invalid_files": []},
+    ]
+    copy_files(save_data, str(tmp_path / "out"), "m", str(tmp_path / "res"))
+    valid = tmp_path / "out" / "decisions" / "m" / "final_processed_inputs" / "fuel" / "valid_bills"
+    assert (valid / "E1_Alice" / "bill.pdf").read_text() == "E1_Alice"
+    # No exact {emp_id}_ folder: falls back to the first folder whose name starts with the id
+    assert (valid / "E1e_Eve" / "bill.pdf").read_text() == "E1extra"
+
+
+def test_summary_counts_unnormalized_reject():
+    decisions = [
+        {"employee_id": "E1", "employee_name": "Alice", "category": "fuel", "month": "2025-01", "decision": "APPROVE"},
+        {"employee_id": "E1", "employee_name": "Alice", "category": "fuel", "month": "2025-01", "decision": " Reject "},
+    ]
+    summary = build_summary_from_grouped(group_decisions(decisions))
+    assert summary["E1_Alice"]["fuel"]["2025-01"]["decision"] == "REJECT"
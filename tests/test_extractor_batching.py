@@ -0,0 +1,221 @@
+"""Tests for app.extractors.base_extractor batching and parse retries (no real LLM or OCR calls)."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import SystemMessage
+
+from app.extractors.base_extractor import BaseInvoiceExtractor, _parser_for, run_batched
+from app.extractors.cache import ExtractionCache
+from entity.fuel_extraction_schema import FuelExtractionList
+
+
+class _FakeExtractor(BaseInvoiceExtractor):
+    """Skips OCR/LLM setup; _aextract echoes filenames so routing can be checked."""
+
+    def __init__(self, name, receipts, calls):
+        self.name = name
+        self.input_folder = name
+        self.receipts = receipts
+        self.calls = calls
+
+    async def _aextract(self, receipts):
+        self.calls.append([fn for rec in receipts for fn in rec])
+        return [{"filename": fn} for rec in receipts for fn in rec]
+
+    def _finalize(self, items, save_to_file=True):
+        return [{**item, "folder": self.name} for item in items]
+
+
+def test_run_batched_groups_receipts_across_folders():
+    calls = []
+    a = _FakeExtractor("oct", [{"a1.pdf": "t"}, {"a2.pdf": "t"}], calls)
+    b = _FakeExtractor("nov", [{"b1.pdf": "t"}], calls)
+    results = run_batched([a, b], batch_size=2, save_to_file=False)
+    assert calls == [["a1.pdf", "a2.pdf"], ["b1.pdf"]]
+    assert [(r["filename"], r["folder"]) for r in results] == [
+        ("a1.pdf", "oct"), ("a2.pdf", "oct"), ("b1.pdf", "nov"),
+    ]
+
+
+def test_run_batched_never_mixes_duplicate_filenames():
+    calls = []
+    a = _FakeExtractor("oct", [{"bill.pdf": "t"}], calls)
+    b = _FakeExtractor("nov", [{"bill.pdf": "t"}], calls)
+    results = run_batched([a, b], batch_size=8, save_to_file=False)
+    assert len(calls) == 2
+    assert [r["folder"] for r in results] == ["oct", "nov"]
+
+
+def test_run_batched_reextracts_unroutable_mixed_batch_per_folder():
+    calls = []
+
+    class _RenamingExtractor(_FakeExtractor):
+        async def _aextract(self, receipts):
+            names = [fn for rec in receipts for fn in rec]
+            self.calls.append(names)
+            # The model mangles filenames when it sees several folders at once
+            if len(names) > 1:
+                return [{"filename": f"renamed-{fn}"} for fn in names]
+            return [{"filename": "renamed"}]
+
+    a = _RenamingExtractor("oct", [{"a1.pdf": "t"}], calls)
+    b = _RenamingExtractor("nov", [{"b1.pdf": "t"}], calls)
+    results = run_batched([a, b], batch_size=4, save_to_file=False)
+    assert calls == [["a1.pdf", "b1.pdf"], ["a1.pdf"], ["b1.pdf"]]
+    assert [r["folder"] for r in results] == ["oct", "nov"]
+
+
+def test_run_batched_skips_failed_batch():
+    calls = []
+
+    class _Failing(_FakeExtractor):
+        async def _aextract(self, receipts):
+            raise RuntimeError("boom")
+
+    a = _Failing("oct", [{"a1.pdf": "t"}], calls)
+    assert run_batched([a], batch_size=4, save_to_file=False) == []
+
+
+def test_run_batched_drops_folder_when_one_of_its_batches_fails():
+    calls = []
+    finalized = []
+
+    class _FailsOnSecond(_FakeExtractor):
+        async def _aextract(self, receipts):
+            if any("a2.pdf" in rec for rec in receipts):
+                raise RuntimeError("boom")
+            return await super()._aextract(receipts)
+
+        def _finalize(self, items, save_to_file=True):
+            finalized.append(self.name)
+            return super()._finalize(items, save_to_file)
+
+    a = _FailsOnSecond("oct", [{"a1.pdf": "t"}, {"a2.pdf": "t"}], calls)
+    b = _FailsOnSecond("nov", [{"b1.pdf": "t"}], calls)
+    results = run_batched([a, b], batch_size=1, save_to_file=False)
+    # oct's first batch succeeded, but saving it alone would overwrite oct.json with a partial list
+    assert finalized == ["nov"]
+    assert [r["folder"] for r in results] == ["nov"]
+
+
+def test_run_batched_finalize_error_only_loses_that_folder():
+    calls = []
+
+    class _BadValidator(_FakeExtractor):
+        def _finalize(self, items, save_to_file=True):
+            if self.name == "oct":
+                raise ValueError("validator blew up")
+            return super()._finalize(items, save_to_file)
+
+    a = _BadValidator("oct", [{"a1.pdf": "t"}], calls)
+    b = _BadValidator("nov", [{"b1.pdf": "t"}], calls)
+    results = run_batched([a, b], batch_size=1, save_to_file=False)
+    assert [r["folder"] for r in results] == ["nov"]
+
+
+def test_run_batched_reuses_one_event_loop_across_calls():
+    loops = []
+
+    class _LoopRecording(_FakeExtractor):
+        async def _aextract(self, receipts):
+            loops.append(asyncio.get_running_loop())
+            return await super()._aextract(receipts)
+
+    for _ in range(2):
+        run_batched([_LoopRecording("oct", [{"a1.pdf": "t"}], [])], batch_size=4, save_to_file=False)
+    # A per-call asyncio.run() would leave the first loop closed (and pooled connections bound to it dead)
+    assert loops[0] is loops[1] and not loops[0].is_closed()
+
+
+def test_run_batched_from_worker_threads_shares_one_event_loop():
+    loops = set()
+
+    class _LoopRecording(_FakeExtractor):
+        async def _aextract(self, receipts):
+            loops.add(asyncio.get_running_loop())
+            await asyncio.sleep(0.01)
+            return await super()._aextract(receipts)
+
+    def process(emp):
+        return run_batched([_LoopRecording(emp, [{f"{emp}.pdf": "t"}], [])], batch_size=4, save_to_file=False)
+
+    # Same shape as the employee thread pool in app: several run_batched calls at once
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(process, ["e1", "e2", "e3", "e4"]))
+    assert [r[0]["folder"] for r in results] == ["e1", "e2", "e3", "e4"]
+    assert len(loops) == 1
+
+
+def _llm_extractor(responses):
+    extractor = BaseInvoiceExtractor.__new__(BaseInvoiceExtractor)
+    extractor._system_message = SystemMessage(content="system")
+    extractor.schema_class = FuelExtractionList
+    extractor.parser, _ = _parser_for(FuelExtractionList)
+    extractor._static_system = "system"
+    extractor.llm = FakeListChatModel(responses=responses)
+    return extractor
+
+
+def test_extract_retries_after_unparseable_reply():
+    extractor = _llm_extractor(["not json", '[{"filename": "f.pdf", "amount": 10}]'])
+    assert extractor._extract([{"f.pdf": "t"}])[0]["amount"] == 10.0
+
+
+def test_extract_reuses_cached_result(tmp_path):
+    extractor = _llm_extractor(['[{"filename": "f.pdf", "amount": 10}]'])
+    extractor.cache = ExtractionCache(str(tmp_path))
+    first = extractor._extract([{"f.pdf": "t"}])
+    extractor.llm = FakeListChatModel(responses=["not json"])
+    assert extractor._extract([{"f.pdf": "t"}]) == first
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_run_shards_large_folder():
+    calls = []
+    a = _FakeExtractor("oct", [{f"a{i}.pdf": "t"} for i in range(5)], calls)
+    results = a.run(save_to_file=False, batch_size=2)
+    assert [len(c) for c in calls] == [2, 2, 1]
+    assert len(results) == 5
+
+
+def test_run_sharded_folder_with_failed_shard_saves_nothing():
+    calls = []
+    saved = []
+
+    class _OneBadShard(_FakeExtractor):
+        async def _aextract(self, receipts):
+            if any("a3.pdf" in rec for rec in receipts):
+                raise RuntimeError("boom")
+            return await super()._aextract(receipts)
+
+        def _finalize(self, items, save_to_file=True):
+            saved.append(len(items))
+            return super()._finalize(items, save_to_file)
+
+    a = _OneBadShard("oct", [{f"a{i}.pdf": "t"} for i in range(5)], calls)
+    assert a.run(save_to_file=True, batch_size=2) == []
+    assert saved == []
+
+
+def test_run_sharded_folder_survives_finalize_error():
+    class _BadFinalize(_FakeExtractor):
+        def _finalize(self, items, save_to_file=True):
+            raise ValueError("write failed")
+
+    a = _BadFinalize("oct", [{f"a{i}.pdf": "t"} for i in range(3)], [])
+    assert a.run(save_to_file=False, batch_size=2) == []
+
+
+def test_extraction_cache_concurrent_puts_of_one_key_stay_valid(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    items = [{"filename": f"f{i}.pdf", "amount": i} for i in range(200)]
+
+    def put(n):
+        cache.put("same-key", items, writer=n)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(put, range(32)))
+    assert cache.get("same-key") == items
+    assert not list(tmp_path.glob("*.tmp"))
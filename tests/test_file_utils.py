@@ -0,0 +1,46 @@
+"""Tests for commons.file_utils (atomic writes, Parquet bill copies)."""
+
+import pytest
+
+from commons.file_utils import FileUtils
+
+
+def test_write_bytes_atomic_creates_dirs_and_replaces(tmp_path):
+    path = tmp_path / "cache" / "entry.json"
+    FileUtils.write_bytes_atomic(str(path), b"old")
+    FileUtils.write_bytes_atomic(str(path), b"new")
+    assert path.read_bytes() == b"new"
+    assert [p.name for p in path.parent.iterdir()] == ["entry.json"]
+
+
+def test_write_bytes_atomic_leaves_target_and_no_temp_file_on_error(tmp_path):
+    path = tmp_path / "entry.json"
+    path.write_bytes(b"old")
+    with pytest.raises(TypeError):
+        FileUtils.write_bytes_atomic(str(path), "not bytes")
+    assert path.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["entry.json"]
+
+
+def test_bills_parquet_round_trips_uniform_rows(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "oct.json.parquet")
+    bills = [
+        {"id": "b1", "amount": 10.5, "validation": {"is_valid": True, "reasons": []}},
+        {"id": "b2", "amount": 20.0, "validation": {"is_valid": False, "reasons": ["date"]}},
+    ]
+    assert FileUtils.write_bills_parquet(bills, path) is True
+    assert FileUtils.read_bills_parquet(path) == bills
+
+
+def test_bills_parquet_skips_rows_that_would_not_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "oct.json.parquet"
+    path.write_bytes(b"stale")
+    # Missing keys and empty dicts would come back as None
+    bills = [
+        {"id": "b1", "amount": 10.5, "meta": {}},
+        {"id": "b2", "date": "01/10/2025", "meta": {"source": "ocr"}},
+    ]
+    assert FileUtils.write_bills_parquet(bills, str(path)) is False
+    assert not path.exists()
@@ -0,0 +1,24 @@
+"""Tests for commons.utils file helpers."""
+
+import os
+
+import pytest
+
+from commons.utils import fast_copy
+
+
+def test_fast_copy_copies_contents(tmp_path):
+    src = tmp_path / "bill.pdf"
+    src.write_bytes(b"%PDF-1.4 receipt")
+    fast_copy(str(src), str(tmp_path / "copy.pdf"))
+    assert (tmp_path / "copy.pdf").read_bytes() == b"%PDF-1.4 receipt"
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="copy_file_range not available")
+def test_fast_copy_falls_back_when_copy_file_range_copies_nothing(tmp_path, monkeypatch):
+    # Some filesystems return 0 from copy_file_range for a non-empty source
+    monkeypatch.setattr(os, "copy_file_range", lambda *args: 0)
+    src = tmp_path / "bill.pdf"
+    src.write_bytes(b"%PDF-1.4 receipt")
+    fast_copy(str(src), str(tmp_path / "copy.pdf"))
+    assert (tmp_path / "copy.pdf").read_bytes() == b"%PDF-1.4 receipt"
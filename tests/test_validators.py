@@ -287,3 +287,16 @@ class TestRideValidator:
         v.validate(bill, context)
         assert "id" in bill
         assert bill["id"].startswith("MANUAL-")
+
+    def test_validate_many_matches_per_ride_validate(self):
+        v = RideValidator()
+        context = {"client_addresses": {"ACME": ["123 main st"], "XYZ": ["official office address only"]}}
+        rides = [
+            {"id": "1", "filename": "a.pdf", "date": "05/04/2025", "emp_month": "apr", "emp_name": "a",
+             "rider_name": "a", "client": "acme", "pickup_address": "123 Main St", "drop_address": "home"},
+            {"id": "2", "filename": "b.pdf", "date": "05/04/2025", "emp_month": "apr", "emp_name": "a",
+             "rider_name": "a", "client": "XYZ", "pickup_address": "random place", "drop_address": "other"},
+            {"id": "3", "filename": "c.pdf", "date": "05/04/2025", "emp_month": "apr", "emp_name": "a",
+             "rider_name": "a", "client": "unknown", "pickup_address": "x", "drop_address": "y"},
+        ]
+        assert v.validate_many(rides, context) == [v.validate(r, context) for r in rides]